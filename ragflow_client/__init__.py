@@ -1,6 +1,33 @@
 """RAGflow API 客户端包"""
-from .api import RAGflowClient
-from .exceptions import RAGflowAPIError
+import importlib
+from typing import TYPE_CHECKING
 
 __version__ = "0.1.0"
-__all__ = ["RAGflowClient", "RAGflowAPIError"]
\ No newline at end of file
+
+# 按需导入（PEP 562）：import ragflow_client 时不加载 requests 等依赖，首次访问对应名称时才导入
+_LAZY_ATTRS = {
+    "RAGflowClient": ".api",
+    "RAGflowAPIError": ".exceptions",
+    "AsyncRAGflowClient": ".async_api",
+}
+
+if TYPE_CHECKING:
+    from .api import RAGflowClient
+    from .async_api import AsyncRAGflowClient
+    from .exceptions import RAGflowAPIError
+
+
+def __getattr__(name):
+    module = _LAZY_ATTRS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
+
+
+__all__ = ["RAGflowClient", "RAGflowAPIError"]
@@ -0,0 +1,141 @@
+"""
+基于 httpx.Client 的同步传输，提供 RAGflowClient 用到的 requests.Session 接口子集。
+
+RAGflowClient(transport='httpx') 时使用，可启用 HTTP/2，多个线程的并发请求在同一条连接上多路复用。
+"""
+import importlib.util
+import time
+from datetime import timedelta
+from typing import Any, Dict, Iterator, Optional, Union
+
+import httpx
+
+# http2=True 依赖可选的 h2 包，未安装时退回 HTTP/1.1
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# 以文件对象作为请求体时每次读取的字节数
+_BODY_CHUNK_SIZE = 64 * 1024
+
+
+class _RawStream:
+    """模拟 urllib3 响应的 raw 属性，供 shutil.copyfileobj 逐块读取（httpx 已按 Content-Encoding 解压）。"""
+
+    decode_content = True
+
+    def __init__(self, response: httpx.Response):
+        self._response = response
+        self._chunks: Optional[Iterator[bytes]] = None
+
+    def read(self, size: int = -1) -> bytes:
+        if self._chunks is None:
+            self._chunks = self._response.iter_bytes(size if size > 0 else None)
+        return next(self._chunks, b"")
+
+
+class HttpxResponse:
+    """包装 httpx.Response，提供 RAGflowClient 用到的 requests.Response 属性和方法。"""
+
+    def __init__(self, response: httpx.Response, elapsed: float):
+        self._response = response
+        self.status_code = response.status_code
+        self.elapsed = timedelta(seconds=elapsed)
+
+    @property
+    def ok(self) -> bool:
+        return not self._response.is_error
+
+    @property
+    def content(self) -> bytes:
+        return self._response.read()
+
+    @property
+    def text(self) -> str:
+        self._response.read()
+        return self._response.text
+
+    @property
+    def raw(self) -> _RawStream:
+        return _RawStream(self._response)
+
+    def iter_lines(self) -> Iterator[str]:
+        return self._response.iter_lines()
+
+    def close(self) -> None:
+        self._response.close()
+
+    def __enter__(self) -> "HttpxResponse":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+class HttpxSession:
+    """
+    以 httpx.Client 实现的会话，接口与 RAGflowClient 使用的 requests.Session 方法一致。
+
+    与 requests 相同，会话默认头可被单次请求的头覆盖，值为 None 的头表示不发送该头。
+    httpx 只对建立连接失败进行重试，不会按状态码重试。
+    """
+
+    def __init__(self, headers: Dict[str, str], http2: bool = True, pool_size: int = 32, max_retries: int = 5):
+        """
+        Args:
+            headers (Dict[str, str]): 每个请求默认携带的头
+            http2 (bool): 是否启用 HTTP/2，默认 True；未安装 h2 时自动退回 HTTP/1.1
+            pool_size (int): 连接池大小，默认 32
+            max_retries (int): 建立连接失败时的最大重试次数，默认 5
+        """
+        self.headers = dict(headers)
+        http2 = http2 and _HTTP2_AVAILABLE
+        limits = httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+        self._client = httpx.Client(
+            http2=http2,
+            limits=limits,
+            transport=httpx.HTTPTransport(http2=http2, limits=limits, retries=max_retries),
+            timeout=None,
+        )
+
+    def request(self, method: str, url: str, params: Optional[Dict[str, Any]] = None, data: Any = None,
+                files: Any = None, headers: Optional[Dict[str, Optional[str]]] = None, stream: bool = False,
+                timeout: Union[None, float, tuple] = None) -> HttpxResponse:
+        """发送请求，参数含义与 requests.Session.request 相同。"""
+        merged = {**self.headers, **(headers or {})}
+        merged = {key: value for key, value in merged.items() if value is not None}
+        content = None
+        if hasattr(data, "read"):
+            # 流式请求体（如 MultipartEncoder），逐块读取发送
+            length = getattr(data, "len", None)
+            if length is not None:
+                merged["Content-Length"] = str(length)
+            content, data = iter(lambda body=data: body.read(_BODY_CHUNK_SIZE), b""), None
+        elif isinstance(data, (bytes, str)):
+            content, data = data, None
+        if files is not None:
+            # 与 requests 一样先把文件内容读入内存，使请求带有 Content-Length 而不是使用分块传输编码
+            files = [(field, (name, fp.read() if hasattr(fp, "read") else fp, *rest))
+                     for field, (name, fp, *rest) in files]
+        if isinstance(timeout, tuple):
+            timeout = httpx.Timeout(timeout[1], connect=timeout[0])
+        request = self._client.build_request(method, url, params=params, content=content, data=data,
+                                             files=files, headers=merged,
+                                             timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT)
+        start = time.monotonic()
+        response = self._client.send(request, stream=True)
+        elapsed = time.monotonic() - start
+        if not stream:
+            try:
+                response.read()
+            finally:
+                response.close()
+        return HttpxResponse(response, elapsed)
+
+    def get(self, url: str, **kwargs) -> HttpxResponse:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> HttpxResponse:
+        return self.request("POST", url, **kwargs)
+
+    def close(self) -> None:
+        """关闭会话，释放连接池中的连接。"""
+        self._client.close()
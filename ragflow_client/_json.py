@@ -0,0 +1,22 @@
+"""JSON 编解码：优先使用 orjson（C 扩展，速度快数倍），未安装时退回标准库 json。"""
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(obj: Any) -> bytes:
+    """将对象序列化为 UTF-8 编码的 JSON 字节串。"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), allow_nan=False).encode("utf-8")
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """解析 JSON 字节串或字符串。"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
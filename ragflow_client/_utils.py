@@ -0,0 +1,27 @@
+"""客户端内部共用的小工具函数。"""
+from typing import Any, Dict
+
+# 各接口的路径模板，占位符按顺序用 str.format 填入资源 ID
+API_PATHS = {
+    "datasets": "/api/v1/datasets",
+    "dataset": "/api/v1/datasets/{}",
+    "dataset_chunks": "/api/v1/datasets/{}/chunks",
+    "documents": "/api/v1/datasets/{}/documents",
+    "document": "/api/v1/datasets/{}/documents/{}",
+    "chunks": "/api/v1/datasets/{}/documents/{}/chunks",
+    "chunk": "/api/v1/datasets/{}/documents/{}/chunks/{}",
+    "retrieval": "/api/v1/retrieval",
+    "chats": "/api/v1/chats",
+    "chat": "/api/v1/chats/{}",
+    "chat_completions": "/api/v1/chats/{}/completions",
+    "sessions": "/api/v1/chats/{}/sessions",
+    "session": "/api/v1/chats/{}/sessions/{}",
+    "agents": "/api/v1/agents",
+    "agent_completions": "/api/v1/agents/{}/completions",
+    "agent_sessions": "/api/v1/agents/{}/sessions",
+}
+
+
+def compact(**fields: Any) -> Dict[str, Any]:
+    """返回去掉值为 None 的字段后的字典，用于构造只包含已指定字段的更新请求体。"""
+    return {key: value for key, value in fields.items() if value is not None}
@@ -1,24 +1,474 @@
+import copy
+import gzip
+import hashlib
+import inspect
+import math
+import shutil
+import threading
+import time
+import unicodedata
+import uuid
 import requests
-from typing import List, Dict, Optional, Union, Any
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+try:
+    from requests_toolbelt import MultipartEncoder
+except ImportError:  # 可选依赖，未安装时由 requests 在内存中编码 multipart 请求体
+    MultipartEncoder = None
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from typing import TYPE_CHECKING, BinaryIO, Callable, Iterator, List, Dict, Optional, Tuple, Union, Any
 from pathlib import Path
+from . import __version__
+from ._json import dumps, loads
+from ._utils import API_PATHS, compact
+from .cache import LRUCache, SingleFlight
 from .exceptions import RAGflowAPIError
+from .metrics import ClientMetrics
+from .streaming import EventStream
+
+if TYPE_CHECKING:
+    from .embedding_cache import CachedEmbedder
+    from .response_cache import ResponseCache
+    from .semantic_cache import SemanticCache
+
+
+# 下载文档时每次从连接读取并写入文件的字节数
+_DOWNLOAD_CHUNK_SIZE = 1 << 20
+
+# 未安装 requests-toolbelt 时，一批上传文件中同时预读的最大文件数
+_UPLOAD_READ_WORKERS = 4
+
+# 文档解析的终止状态（接口可能返回状态名或对应的数字编码）
+_PARSE_FINISHED = {"DONE", "FAIL", "CANCEL", "3", "4", "2"}
+
+
+def _build_retry(total: int) -> Retry:
+    """
+    构造连接池的重试策略：对 429 和 502/503/504 按指数退避（带随机抖动）重试，并遵循 Retry-After；
+    连接错误和读取超时各最多重试 3 次。
+
+    只重试幂等方法，POST 可能已在服务端生效，重试会重复创建资源。重试耗尽后返回最后一个响应，
+    由调用方统一转换为 RAGflowAPIError。
+    """
+    options = dict(total=total, connect=3, read=3, backoff_factor=0.5, status_forcelist=[429, 502, 503, 504],
+                   allowed_methods=frozenset(["GET", "PUT", "DELETE", "HEAD", "OPTIONS"]),
+                   respect_retry_after_header=True, raise_on_status=False)
+    # backoff_jitter 需要 urllib3 2.x
+    if "backoff_jitter" in inspect.signature(Retry.__init__).parameters:
+        options["backoff_jitter"] = 0.3
+    return Retry(**options)
+
+
+def _read_upload_file(file_path: Union[str, Path]) -> Tuple[str, Tuple[str, bytes]]:
+    """读取待上传的文件，返回 requests files 参数所需的字段。"""
+    path = Path(file_path)
+    return 'file', (path.name, path.read_bytes())
+
+
+class _LazyFile:
+    """
+    延迟打开的只读文件：第一次 read 时才打开，读到末尾立即关闭。
+
+    MultipartEncoder 按顺序逐个读取字段，因此一个请求中同一时刻最多只占用一个文件描述符。
+    len 属性为剩余未读的字节数，供 MultipartEncoder 计算 Content-Length。
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.len = self.path.stat().st_size
+        self._fp = None
+
+    def read(self, size: int = -1) -> bytes:
+        if self._fp is None:
+            if self.len == 0:
+                return b''
+            self._fp = open(self.path, 'rb')
+        data = self._fp.read(size)
+        # 读到末尾（或文件在发送途中被截断）时将剩余长度归零，避免 MultipartEncoder 一直等待数据
+        self.len = max(self.len - len(data), 0) if data else 0
+        if self.len == 0:
+            self.close()
+        return data
+
+    def close(self) -> None:
+        if self._fp is not None:
+            self._fp.close()
+            self._fp = None
+
+
+def _normalize_question(question: str) -> str:
+    """归一化问题文本，使全半角、大小写和首尾空白不同的相同问题命中同一缓存项。"""
+    return unicodedata.normalize("NFKC", question).strip().casefold()
+
 
 class RAGflowClient:
     """RAGflow API 客户端，用于与 RAGflow 服务交互。"""
 
-    def __init__(self, base_url: str, api_key: str):
+    def __init__(self, base_url: str, api_key: str, answer_cache_size: int = 512,
+                 answer_cache_ttl: float = 600, semantic_cache: Optional["SemanticCache"] = None,
+                 compress_requests: bool = False, compress_threshold: int = 4096, max_retries: int = 5,
+                 pool_size: int = 32, read_cache_size: int = 1024, read_cache_ttl: float = 30,
+                 retrieval_semantic_cache: Optional["SemanticCache"] = None, transport: str = "requests",
+                 http2: bool = True, timeout: Union[None, float, Tuple[float, float]] = (5, 60),
+                 response_cache: Optional["ResponseCache"] = None):
         """
         初始化 RAGflow 客户端。
 
+        客户端内部持有一个共享的会话（默认为 requests.Session），所有请求复用其连接池（keep-alive），
+        避免每次调用都重新建立 TCP/TLS 连接。使用完毕后应调用 close()，或通过 with 语句使用。
+
         Args:
             base_url (str): RAGflow 服务的基础 URL，例如 'http://localhost:5000'
             api_key (str): API 密钥，用于身份验证
+            answer_cache_size (int): 对话答案缓存的最大条目数，默认 512
+            answer_cache_ttl (float): 对话答案缓存的有效期（秒），默认 600
+            semantic_cache (Optional[SemanticCache]): 语义答案缓存，用于命中改写过的近似问题；
+                需要安装 numpy 并提供嵌入函数，默认不启用
+            compress_requests (bool): 是否对较大的 JSON 请求体进行 gzip 压缩，默认 False；
+                仅在服务端（或其前置网关）支持 Content-Encoding: gzip 请求时启用
+            compress_threshold (int): 触发压缩的最小请求体字节数，默认 4096
+            max_retries (int): 遇到连接错误或 429/502/503/504 时的最大重试次数，默认 5
+            pool_size (int): 连接池大小，即可同时保持的连接数，默认 32；多线程并发调用时应不小于线程数
+            read_cache_size (int): 只读接口（list_* 和 retrieve_chunks）响应缓存的最大条目数，默认 1024
+            read_cache_ttl (float): 只读接口响应缓存的有效期（秒），默认 30；设为 0 可关闭该缓存
+            retrieval_semantic_cache (Optional[SemanticCache]): 检索结果的语义缓存，改写过的近似问题
+                直接复用之前的检索结果；应使用独立于 semantic_cache 的实例，默认不启用
+            transport (str): HTTP 传输实现，"requests"（默认）或 "httpx"；httpx 传输需要安装 httpx，
+                支持 HTTP/2 多路复用，但只对连接错误重试，不按状态码重试
+            http2 (bool): transport 为 "httpx" 时是否启用 HTTP/2，默认 True；未安装 h2 时自动退回 HTTP/1.1
+            timeout (Union[None, float, Tuple[float, float]]): 请求超时（秒），可为 (连接超时, 读取超时)，
+                默认 (5, 60)；读取超时指两次收到数据之间的最长间隔，非流式对话生成较长答案时可能需要调大；
+                None 表示不超时
+            response_cache (Optional[ResponseCache]): retrieve_chunks 结果的持久化缓存，进程重启后仍可命中，
+                在内存缓存之后查找；条目按 API 密钥隔离，默认不启用
+
+        响应体的压缩由 requests 自动协商：默认接受 gzip/deflate，安装 brotli 或 zstandard 后
+        （urllib3 2.x）还会接受 br 和 zstd。
         """
         self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        # 预先拼接好完整的 URL 模板，各方法只需填入资源 ID
+        self._u = {name: self.base_url + path for name, path in API_PATHS.items()}
         self.headers = {
             'Authorization': f'Bearer {api_key}',
             'Content-Type': 'application/json'
         }
+        if transport == "httpx":
+            from ._httpx_session import HttpxSession
+
+            self._session = HttpxSession({**self.headers, 'User-Agent': f'ragflow-client/{__version__}'},
+                                         http2=http2, pool_size=pool_size, max_retries=max_retries)
+        elif transport == "requests":
+            self._session = requests.Session()
+            self._session.headers.update(self.headers)
+            self._session.headers['User-Agent'] = f'ragflow-client/{__version__}'
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size,
+                                  max_retries=_build_retry(max_retries))
+            self._session.mount('http://', adapter)
+            self._session.mount('https://', adapter)
+        else:
+            raise ValueError(f"不支持的 transport: {transport}，可选 'requests' 或 'httpx'")
+        self._answer_cache = LRUCache(maxsize=answer_cache_size, ttl=answer_cache_ttl)
+        # (方法, URL, 查询参数, 请求体) -> 已解析的响应；同一资源集合发生写操作时失效
+        self._read_cache = LRUCache(maxsize=read_cache_size, ttl=read_cache_ttl) \
+            if read_cache_size > 0 and read_cache_ttl > 0 else None
+        self.semantic_cache = semantic_cache
+        self.retrieval_semantic_cache = retrieval_semantic_cache
+        self.response_cache = response_cache
+        # 持久化缓存可能被多个客户端共享，以凭据摘要区分各自的条目
+        self._cache_scope = hashlib.sha256(self.headers['Authorization'].encode("utf-8")).hexdigest()
+        self.compress_requests = compress_requests
+        self.compress_threshold = compress_threshold
+        self._inflight = SingleFlight()
+        # 读缓存的代数：清除缓存时递增，读请求返回时代数已变化说明期间发生了写操作，结果不写入缓存
+        self._generation = 0
+        self._collection_generations: Dict[str, int] = {}
+        self._generation_lock = threading.Lock()
+        # (URL, 请求体摘要) -> 失败调用释放的 Idempotency-Key 列表，供之后的重试取用
+        self._idempotency_keys = LRUCache(maxsize=1024)
+        self._idempotency_lock = threading.Lock()
+        self._metrics = ClientMetrics()
+
+    def close(self) -> None:
+        """关闭客户端，释放连接池中的连接并清空内存缓存。"""
+        self._session.close()
+        self.clear_answer_cache()
+        if self._read_cache is not None:
+            self._read_cache.clear()
+        self._idempotency_keys.clear()
+
+    def __enter__(self) -> "RAGflowClient":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        返回客户端指标的快照，用于评估缓存效果和接口延迟。
+
+        Returns:
+            Dict[str, Any]: 各缓存的命中/未命中次数和命中率，以及各接口的请求次数和平均首字节时间
+        """
+        return self._metrics.snapshot()
+
+    def track_embedder(self, embedder: "CachedEmbedder") -> None:
+        """
+        让 CachedEmbedder 的缓存命中情况计入本客户端的 metrics()（缓存名为 "embedding"）。
+
+        Args:
+            embedder (CachedEmbedder): 嵌入函数包装，通常同时作为 semantic_cache 的 embed 参数
+        """
+        embedder.metrics = self._metrics
+
+    def clear_answer_cache(self) -> None:
+        """
+        清空对话答案缓存。
+
+        数据集、文档、分块或聊天助手发生变更时会自动调用，避免返回基于旧知识的答案。
+        """
+        self._answer_cache.clear()
+        if self.semantic_cache is not None:
+            self.semantic_cache.clear()
+
+    def clear_read_cache(self, prefix: Optional[str] = None) -> None:
+        """
+        清空只读接口的响应缓存。
+
+        客户端自身的写操作会自动使对应资源集合的缓存失效；数据被其他客户端修改时，
+        可调用此方法立即丢弃可能过期的响应。配置了 response_cache 时同时清除持久化缓存中
+        本服务、本 API 密钥的条目。
+
+        Args:
+            prefix (Optional[str]): 只清除路径以此开头的条目，例如 "/api/v1/datasets"；默认全部清除
+        """
+        if self.retrieval_semantic_cache is not None and (prefix is None or "/api/v1/retrieval".startswith(prefix)):
+            self.retrieval_semantic_cache.clear()
+        collection = self._collection(prefix or "")
+        url_prefix = self.base_url + (prefix or "")
+        with self._generation_lock:
+            # 使此前发出、尚未返回的读请求不再写入缓存
+            if collection.count("/") < 3:
+                self._generation += 1
+            else:
+                self._collection_generations[collection] = self._collection_generations.get(collection, 0) + 1
+            if self.response_cache is not None:
+                self.response_cache.evict(url_prefix, scope=self._cache_scope)
+            if self._read_cache is not None:
+                self._read_cache.evict(lambda key: key[1].startswith(url_prefix))
+
+    @staticmethod
+    def _collection(path: str) -> str:
+        """返回路径所属的资源集合，例如 /api/v1/datasets/x/documents -> /api/v1/datasets。"""
+        return "/".join(path.split("/")[:4])
+
+    def _read_generation(self, url: str) -> Tuple[int, int]:
+        """返回 url 所属资源集合当前的缓存代数，该集合的缓存每次被清除时变化。"""
+        collection = self._collection(url[len(self.base_url):])
+        return self._generation, self._collection_generations.get(collection, 0)
+
+    def _invalidate_reads(self, url: str) -> None:
+        """写操作后清除同一资源集合（如 /api/v1/datasets）下缓存的读响应。"""
+        collection = self._collection(url[len(self.base_url):])
+        self.clear_read_cache(collection)
+        if collection == "/api/v1/datasets":
+            # 数据集内容变化会影响检索结果
+            self.clear_read_cache("/api/v1/retrieval")
+
+    def _request(self, method: str, url: str, action: str, read_only: Optional[bool] = None,
+                 use_cache: bool = True, persist: bool = False, cache_ttl: Optional[float] = None,
+                 **kwargs) -> Dict:
+        """
+        通过共享会话发送请求并解析 JSON 响应。
+
+        只读请求的成功响应会在 read_cache_ttl 秒内缓存（persist 为 True 且配置了 response_cache 时
+        同时写入持久化缓存），写请求完成后清除同一资源集合下缓存的读响应。
+
+        Args:
+            method (str): HTTP 方法
+            url (str): 请求 URL
+            action (str): 操作描述，用于错误信息
+            read_only (Optional[bool]): 是否为只读请求，默认仅 GET 视为只读
+            use_cache (bool): 只读请求是否使用响应缓存，默认 True
+            persist (bool): 只读请求是否同时使用持久化缓存 response_cache，默认 False
+            cache_ttl (Optional[float]): 写入持久化缓存的存活时间（秒），默认使用 response_cache 的 ttl
+            **kwargs: 传递给 requests 的其他参数
+
+        Returns:
+            Dict: API 响应数据
+
+        Raises:
+            RAGflowAPIError: 如果 API 请求失败
+        """
+        body = None
+        if kwargs.get("json") is not None:
+            # 自行序列化 JSON（会话默认头已声明 Content-Type: application/json），以便使用 orjson 和压缩
+            body = dumps(kwargs.pop("json"))
+            kwargs["data"] = body
+            if self.compress_requests and len(body) > self.compress_threshold:
+                kwargs["data"] = gzip.compress(body, compresslevel=1)
+                kwargs["headers"] = {**kwargs.get("headers", {}), "Content-Encoding": "gzip"}
+        if read_only is None:
+            read_only = method == "GET"
+        if not read_only:
+            try:
+                return self._send(method, url, action, **kwargs)
+            finally:
+                self._invalidate_reads(url)
+        # 用未压缩的请求体计算键：gzip 输出带有时间戳，相同的请求每次压缩结果不同
+        key = (method, url, tuple(sorted((kwargs.get("params") or {}).items())), body)
+        cache = self._read_cache if use_cache else None
+        if cache is not None:
+            cached = cache.get(key)
+            self._metrics.record_cache("read", cached is not None)
+            if cached is not None:
+                return copy.deepcopy(cached)
+        disk = self.response_cache if use_cache and persist else None
+        if disk is not None:
+            disk_key = disk.key(self._cache_scope, *key)
+            cached = disk.get(disk_key)
+            self._metrics.record_cache("persistent", cached is not None)
+            if cached is not None:
+                if cache is not None:
+                    cache.set(key, copy.deepcopy(cached))
+                return cached
+
+        generation = self._read_generation(url)
+
+        def fetch() -> Dict:
+            result = self._send(method, url, action, **kwargs)
+            if result.get("code") == 0 and (cache is not None or disk is not None):
+                with self._generation_lock:
+                    # 请求进行期间本客户端的写操作已清除该集合的缓存，结果可能已过期
+                    if self._read_generation(url) == generation:
+                        if cache is not None:
+                            cache.set(key, copy.deepcopy(result))
+                        if disk is not None:
+                            disk.set(disk_key, self._cache_scope, url, result, ttl=cache_ttl)
+            return result
+
+        # 相同的并发读请求只发送一次；写操作之后发出的读请求不会合并到写之前发出的请求上
+        return self._inflight.do(key + generation, fetch)
+
+    def _create(self, url: str, action: str, data: Dict) -> Dict:
+        """
+        发送创建资源的 POST 请求，并附带 Idempotency-Key 请求头。
+
+        调用失败时 key 被保留，之后相同 URL 和请求体的调用（即调用方的重试）会取回并复用它，
+        支持幂等键的服务端（或网关）可以据此识别重复请求，避免重复创建资源。
+        进行中的调用独占自己的 key，请求体相同的并发调用各自使用不同的 key，不会被当作重复请求丢弃。
+        """
+        key_id = (url, hashlib.sha256(dumps(data)).hexdigest())
+        with self._idempotency_lock:
+            released = self._idempotency_keys.get(key_id)
+            key = released.pop() if released else str(uuid.uuid4())
+        try:
+            return self._request("POST", url, action, json=data, headers={"Idempotency-Key": key})
+        except Exception:
+            with self._idempotency_lock:
+                released = self._idempotency_keys.get(key_id)
+                if released is None:
+                    released = []
+                    self._idempotency_keys.set(key_id, released)
+                released.append(key)
+            raise
+
+    def _send(self, method: str, url: str, action: str, **kwargs) -> Dict:
+        """发送请求并解析 JSON 响应，失败时抛出 RAGflowAPIError。"""
+        response = self._session.request(method, url, timeout=self.timeout, **kwargs)
+        self._metrics.observe_request(action, response.elapsed.total_seconds())
+        if not response.ok:
+            raise RAGflowAPIError(f"{action}失败: {response.status_code} - {response.text}")
+        return loads(response.content)
+
+    def _iter_pages(self, fetch: Callable[[int], Dict], action: str, key: Optional[str],
+                    page_size: int, max_workers: int) -> Iterator[Dict]:
+        """
+        逐条返回分页接口所有页中的条目，第一页之后的页通过线程池并发获取，按页码顺序返回。
+
+        Args:
+            fetch (Callable[[int], Dict]): 按页码获取一页响应的函数
+            action (str): 操作描述，用于错误信息
+            key (Optional[str]): 条目列表在 "data" 中的字段名；为 None 时 "data" 本身即为列表
+            page_size (int): 每页数量
+            max_workers (int): 最大并发请求数
+
+        Yields:
+            Dict: 条目数据
+
+        Raises:
+            RAGflowAPIError: 如果任一 API 请求失败
+        """
+        def items_of(result: Dict) -> List[Dict]:
+            if result.get("code", 0) != 0:
+                raise RAGflowAPIError(f"{action}失败: {result.get('code')} - {result.get('message')}")
+            data = result.get("data") or {}
+            return (data.get(key) if key is not None else data) or []
+
+        first = fetch(1)
+        items = items_of(first)
+        yield from items
+        total = (first.get("data") or {}).get("total") if key is not None else None
+        if total is None and len(items) < page_size:
+            return
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            if total is not None:
+                # 已知总数时一次性提交剩余所有页，并发数由线程池限制
+                for result in executor.map(fetch, range(2, math.ceil(total / page_size) + 1)):
+                    yield from items_of(result)
+                return
+            # 总数未知（如数据集列表）时每轮并发获取 max_workers 页，直到出现不满一页的结果
+            page = 2
+            while True:
+                for result in executor.map(fetch, range(page, page + max_workers)):
+                    items = items_of(result)
+                    yield from items
+                    if len(items) < page_size:
+                        return
+                page += max_workers
+        finally:
+            # 调用方提前停止迭代时不再获取剩余的页
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _batched(self, method: str, url: str, action: str, field: str, ids: List[str],
+                 batch_size: int, max_workers: int) -> Dict:
+        """
+        按 batch_size 拆分 ID 列表（去重后），通过线程池并发发送多个请求并合并响应。
+
+        只有一个批次时直接返回其响应；有多个批次时返回第一个失败（code 不为 0）的批次响应，
+        全部成功时返回第一个批次的响应，并在 "batches" 中附上所有批次的响应。
+
+        Args:
+            method (str): HTTP 方法
+            url (str): 请求 URL
+            action (str): 操作描述，用于错误信息
+            field (str): 请求体中 ID 列表的字段名
+            ids (List[str]): ID 列表
+            batch_size (int): 单个请求最多携带的 ID 数
+            max_workers (int): 最大并发请求数
+
+        Returns:
+            Dict: 合并后的 API 响应数据
+
+        Raises:
+            RAGflowAPIError: 如果任一批次的 API 请求失败
+        """
+        ids = list(dict.fromkeys(ids))
+        # ID 列表为空时仍发送一次请求，保持接口原有的语义
+        batches = [ids[start:start + batch_size] for start in range(0, len(ids) or 1, batch_size)]
+
+        def send(batch: List[str]) -> Dict:
+            return self._request(method, url, action, json={field: batch})
+
+        if len(batches) == 1:
+            return send(batches[0])
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(batches))) as executor:
+            responses = list(executor.map(send, batches))
+        result = dict(next((response for response in responses if response.get("code", 0) != 0), responses[0]))
+        result["batches"] = responses
+        return result
 
     # 数据集管理
     def create_dataset(self, name: str, avatar: Optional[str] = None, description: Optional[str] = None,
@@ -44,7 +494,7 @@ class RAGflowClient:
         Raises:
             RAGflowAPIError: 如果 API 请求失败
         """
-        url = f"{self.base_url}/api/v1/datasets"
+        url = self._u["datasets"]
         data = {
             "name": name,
             "avatar": avatar,
@@ -55,17 +505,16 @@ class RAGflowClient:
             "chunk_method": chunk_method,
             "parser_config": parser_config or {}
         }
-        response = requests.post(url, json=data, headers=self.headers)
-        if not response.ok:
-            raise RAGflowAPIError(f"创建数据集失败: {response.status_code} - {response.text}")
-        return response.json()
+        return self._create(url, "创建数据集", data)
 
-    def delete_datasets(self, ids: List[str]) -> Dict:
+    def delete_datasets(self, ids: List[str], batch_size: int = 100, max_workers: int = 8) -> Dict:
         """
         根据 ID 删除数据集。
 
         Args:
             ids (List[str]): 要删除的数据集 ID 列表
+            batch_size (int): 单个请求最多携带的 ID 数，超出时拆分为多个请求并发发送，默认 100
+            max_workers (int): 最大并发请求数，默认 8
 
         Returns:
             Dict: API 响应数据
@@ -73,12 +522,10 @@ class RAGflowClient:
         Raises:
             RAGflowAPIError: 如果 API 请求失败
         """
-        url = f"{self.base_url}/api/v1/datasets"
-        data = {"ids": ids}
-        response = requests.delete(url, json=data, headers=self.headers)
-        if not response.ok:
-            raise RAGflowAPIError(f"删除数据集失败: {response.status_code} - {response.text}")
-        return response.json()
+        url = self._u["datasets"]
+        result = self._batched("DELETE", url, "删除数据集", "ids", ids, batch_size, max_workers)
+        self.clear_answer_cache()
+        return result
 
     def update_dataset(self, dataset_id: str, name: Optional[str] = None,
                       embedding_model: Optional[str] = None, chunk_method: Optional[str] = None) -> Dict:
@@ -97,15 +544,15 @@ class RAGflowClient:
         Raises:
             RAGflowAPIError: 如果 API 请求失败
         """
-        url = f"{self.base_url}/api/v1/datasets/{dataset_id}"
-        data = {k: v for k, v in {"name": name, "embedding_model": embedding_model, "chunk_method": chunk_method}.items() if v is not None}
-        response = requests.put(url, json=data, headers=self.headers)
-        if not response.ok:
-            raise RAGflowAPIError(f"更新数据集失败: {response.status_code} - {response.text}")
-        return response.json()
+        url = self._u["dataset"].format(dataset_id)
+        data = compact(name=name, embedding_model=embedding_model, chunk_method=chunk_method)
+        result = self._request("PUT", url, "更新数据集", json=data)
+        self.clear_answer_cache()
+        return result
 
     def list_datasets(self, page: int = 1, page_size: int = 30, orderby: str = "create_time",
-                     desc: bool = True, name: Optional[str] = None, id: Optional[str] = None) -> Dict:
+                     desc: bool = True, name: Optional[str] = None, id: Optional[str] = None,
+                     use_cache: bool = True) -> Dict:
         """
         列出数据集。
 
@@ -116,6 +563,7 @@ class RAGflowClient:
             desc (bool): 是否降序，默认 True
             name (Optional[str]): 数据集名称过滤
             id (Optional[str]): 数据集 ID 过滤
+            use_cache (bool): 是否使用只读响应缓存，默认 True
 
         Returns:
             Dict: API 响应数据
@@ -123,41 +571,106 @@ class RAGflowClient:
         Raises:
             RAGflowAPIError: 如果 API 请求失败
         """
-        url = f"{self.base_url}/api/v1/datasets"
+        url = self._u["datasets"]
         params = {"page": page, "page_size": page_size, "orderby": orderby, "desc": str(desc).lower()}
         if name:
             params["name"] = name
         if id:
             params["id"] = id
-        response = requests.get(url, params=params, headers=self.headers)
-        if not response.ok:
-            raise RAGflowAPIError(f"列出数据集失败: {response.status_code} - {response.text}")
-        return response.json()
+        return self._request("GET", url, "列出数据集", use_cache=use_cache, params=params)
+
+    def iter_all_datasets(self, page_size: int = 100, max_workers: int = 8, **filters) -> Iterator[Dict]:
+        """
+        逐个返回所有数据集，自动翻页。
+
+        接口不返回总数，因此每轮通过线程池并发获取 max_workers 页，直到某页不足 page_size 条。
+
+        Args:
+            page_size (int): 每页数量，默认 100
+            max_workers (int): 最大并发请求数，默认 8
+            **filters: 传递给 list_datasets 的其他参数，例如 orderby、name
+
+        Yields:
+            Dict: 数据集信息
+
+        Raises:
+            RAGflowAPIError: 如果 API 请求失败
+        """
+        return self._iter_pages(lambda page: self.list_datasets(page=page, page_size=page_size, **filters),
+                                "列出数据集", None, page_size, max_workers)
 
     # 文件管理
-    def upload_documents(self, dataset_id: str, file_paths: List[Union[str, Path]]) -> Dict:
+    def upload_documents(self, dataset_id: str, file_paths: List[Union[str, Path]],
+                         batch_size: int = 32, max_workers: int = 4) -> Dict:
         """
         上传文档到指定数据集。
 
+        所有文件打包为一个 multipart 请求发送；文件数超过 batch_size 时按批次拆分，
+        以免超出服务端的请求体大小限制。多个批次通过线程池在共享连接池上并发上传，
+        全部成功时各批次的返回数据按原顺序合并到同一个响应中；有批次失败（code 不为 0）时
+        返回第一个失败的批次响应。多个批次时响应的 "batches" 中附有所有批次的响应。
+
         Args:
             dataset_id (str): 数据集 ID
             file_paths (List[Union[str, Path]]): 要上传的文件路径列表
+            batch_size (int): 单个请求最多携带的文件数，默认 32
+            max_workers (int): 同时上传的最大批次数，默认 4
 
         Returns:
             Dict: API 响应数据
 
         Raises:
-            RAGflowAPIError: 如果 API 请求失败
+            RAGflowAPIError: 如果任一批次的 API 请求失败
+        """
+        url = self._u["documents"].format(dataset_id)
+        file_paths = list(file_paths)
+        batches = [file_paths[start:start + batch_size] for start in range(0, len(file_paths) or 1, batch_size)]
+        if len(batches) == 1:
+            responses = [self._upload_batch(url, batches[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(batches))) as executor:
+                responses = list(executor.map(lambda batch: self._upload_batch(url, batch), batches))
+        result = dict(next((response for response in responses if response.get("code", 0) != 0), responses[0]))
+        if len(responses) > 1:
+            if result.get("code", 0) == 0:
+                result["data"] = [doc for response in responses for doc in response.get("data") or []]
+            result["batches"] = responses
+        self.clear_answer_cache()
+        self._invalidate_reads(url)
+        return result
+
+    def _upload_batch(self, url: str, file_paths: List[Union[str, Path]]) -> Dict:
+        """
+        以一个 multipart 请求上传一批文件。
+
+        安装了 requests-toolbelt 时，请求体由 MultipartEncoder 边读文件边发送，文件在被读取时才打开、
+        读完即关闭，同一时刻最多占用一个文件描述符，内存占用与文件大小和数量无关。
+
+        否则 requests 必须先把整个请求体编码到内存中，发送前要读完所有文件；此时通过线程池同时预读
+        多个文件，使各文件的磁盘读取相互重叠，而不是逐个串行读取。
         """
-        url = f"{self.base_url}/api/v1/datasets/{dataset_id}/documents"
-        files = [('file', (Path(fp).name, open(fp, 'rb'))) for fp in file_paths]
-        headers = {'Authorization': self.headers['Authorization']}
-        response = requests.post(url, files=files, headers=headers)
-        for _, f in files:
-            f[1].close()
+        if MultipartEncoder is None:
+            with ThreadPoolExecutor(max_workers=min(_UPLOAD_READ_WORKERS, len(file_paths) or 1)) as reader:
+                files = list(reader.map(_read_upload_file, file_paths))
+            # multipart 请求的 Content-Type 由 requests 根据 boundary 自动生成
+            response = self._session.post(url, files=files, headers={'Content-Type': None}, timeout=self.timeout)
+            return self._check_upload(response)
+        with ExitStack() as stack:
+            files = []
+            for fp in file_paths:
+                lazy = _LazyFile(fp)
+                stack.callback(lazy.close)
+                files.append(('file', (lazy.path.name, lazy)))
+            encoder = MultipartEncoder(fields=files)
+            response = self._session.post(url, data=encoder, headers={'Content-Type': encoder.content_type},
+                                          timeout=self.timeout)
+        return self._check_upload(response)
+
+    def _check_upload(self, response: requests.Response) -> Dict:
+        self._metrics.observe_request("上传文档", response.elapsed.total_seconds())
         if not response.ok:
             raise RAGflowAPIError(f"上传文档失败: {response.status_code} - {response.text}")
-        return response.json()
+        return loads(response.content)
 
     def update_document(self, dataset_id: str, document_id: str, name: Optional[str] = None,
                        chunk_method: Optional[str] = None, parser_config: Optional[Dict] = None) -> Dict:
@@ -177,36 +690,43 @@ class RAGflowClient:
         Raises:
             RAGflowAPIError: 如果 API 请求失败
         """
-        url = f"{self.base_url}/api/v1/datasets/{dataset_id}/documents/{document_id}"
-        data = {k: v for k, v in {"name": name, "chunk_method": chunk_method, "parser_config": parser_config}.items() if v is not None}
-        response = requests.put(url, json=data, headers=self.headers)
-        if not response.ok:
-            raise RAGflowAPIError(f"更新文档失败: {response.status_code} - {response.text}")
-        return response.json()
-
-    def download_document(self, dataset_id: str, document_id: str, output_path: Union[str, Path]) -> None:
+        url = self._u["document"].format(dataset_id, document_id)
+        data = compact(name=name, chunk_method=chunk_method, parser_config=parser_config)
+        result = self._request("PUT", url, "更新文档", json=data)
+        self.clear_answer_cache()
+        return result
+
+    def download_document(self, dataset_id: str, document_id: str,
+                          output_path: Union[str, Path, BinaryIO]) -> None:
         """
         下载指定文档。
 
+        响应体以 1 MiB 为单位直接从连接拷贝到目标文件，不在内存中缓存整个文档。
+
         Args:
             dataset_id (str): 数据集 ID
             document_id (str): 文档 ID
-            output_path (Union[str, Path]): 保存文件的路径
+            output_path (Union[str, Path, BinaryIO]): 保存文件的路径，或已打开的二进制可写文件对象
 
         Raises:
             RAGflowAPIError: 如果 API 请求失败
         """
-        url = f"{self.base_url}/api/v1/datasets/{dataset_id}/documents/{document_id}"
-        response = requests.get(url, headers=self.headers, stream=True)
-        if not response.ok:
-            raise RAGflowAPIError(f"下载文档失败: {response.status_code} - {response.text}")
-        with open(output_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
+        url = self._u["document"].format(dataset_id, document_id)
+        with self._session.get(url, stream=True, timeout=self.timeout) as response:
+            self._metrics.observe_request("下载文档", response.elapsed.total_seconds())
+            if not response.ok:
+                raise RAGflowAPIError(f"下载文档失败: {response.status_code} - {response.text}")
+            # 按 Content-Encoding 解压，与 iter_content 的行为一致
+            response.raw.decode_content = True
+            if hasattr(output_path, 'write'):
+                shutil.copyfileobj(response.raw, output_path, _DOWNLOAD_CHUNK_SIZE)
+            else:
+                with open(output_path, 'wb') as f:
+                    shutil.copyfileobj(response.raw, f, _DOWNLOAD_CHUNK_SIZE)
 
     def list_documents(self, dataset_id: str, page: int = 1, page_size: int = 30,
                       orderby: str = "create_time", desc: bool = True, keywords: Optional[str] = None,
-                      id: Optional[str] = None, name: Optional[str] = None) -> Dict:
+                      id: Optional[str] = None, name: Optional[str] = None, use_cache: bool = True) -> Dict:
         """
         列出指定数据集中的文档。
 
@@ -219,6 +739,7 @@ class RAGflowClient:
             keywords (Optional[str]): 标题关键词过滤
             id (Optional[str]): 文档 ID 过滤
             name (Optional[str]): 文档名称过滤
+            use_cache (bool): 是否使用只读响应缓存，默认 True
 
         Returns:
             Dict: API 响应数据
@@ -226,7 +747,7 @@ class RAGflowClient:
         Raises:
             RAGflowAPIError: 如果 API 请求失败
         """
-        url = f"{self.base_url}/api/v1/datasets/{dataset_id}/documents"
+        url = self._u["documents"].format(dataset_id)
         params = {"page": page, "page_size": page_size, "orderby": orderby, "desc": str(desc).lower()}
         if keywords:
             params["keywords"] = keywords
@@ -234,18 +755,41 @@ class RAGflowClient:
             params["id"] = id
         if name:
             params["name"] = name
-        response = requests.get(url, params=params, headers=self.headers)
-        if not response.ok:
-            raise RAGflowAPIError(f"列出文档失败: {response.status_code} - {response.text}")
-        return response.json()
+        return self._request("GET", url, "列出文档", use_cache=use_cache, params=params)
 
-    def delete_documents(self, dataset_id: str, ids: List[str]) -> Dict:
+    def iter_all_documents(self, dataset_id: str, page_size: int = 200, max_workers: int = 8,
+                           **filters) -> Iterator[Dict]:
+        """
+        逐个返回指定数据集中的所有文档，自动翻页。
+
+        先获取第一页得到文档总数，其余页通过线程池在共享连接池上并发获取，按页码顺序返回。
+
+        Args:
+            dataset_id (str): 数据集 ID
+            page_size (int): 每页数量，默认 200
+            max_workers (int): 最大并发请求数，默认 8
+            **filters: 传递给 list_documents 的其他参数，例如 keywords、orderby
+
+        Yields:
+            Dict: 文档信息
+
+        Raises:
+            RAGflowAPIError: 如果 API 请求失败
+        """
+        return self._iter_pages(
+            lambda page: self.list_documents(dataset_id, page=page, page_size=page_size, **filters),
+            "列出文档", "docs", page_size, max_workers)
+
+    def delete_documents(self, dataset_id: str, ids: List[str], batch_size: int = 100,
+                         max_workers: int = 8) -> Dict:
         """
         删除指定数据集中的文档。
 
         Args:
             dataset_id (str): 数据集 ID
             ids (List[str]): 要删除的文档 ID 列表
+            batch_size (int): 单个请求最多携带的 ID 数，超出时拆分为多个请求并发发送，默认 100
+            max_workers (int): 最大并发请求数，默认 8
 
         Returns:
             Dict: API 响应数据
@@ -253,20 +797,21 @@ class RAGflowClient:
         Raises:
             RAGflowAPIError: 如果 API 请求失败
         """
-        url = f"{self.base_url}/api/v1/datasets/{dataset_id}/documents"
-        data = {"ids": ids}
-        response = requests.delete(url, json=data, headers=self.headers)
-        if not response.ok:
-            raise RAGflowAPIError(f"删除文档失败: {response.status_code} - {response.text}")
-        return response.json()
+        url = self._u["documents"].format(dataset_id)
+        result = self._batched("DELETE", url, "删除文档", "ids", ids, batch_size, max_workers)
+        self.clear_answer_cache()
+        return result
 
-    def parse_documents(self, dataset_id: str, document_ids: List[str]) -> Dict:
+    def parse_documents(self, dataset_id: str, document_ids: List[str], batch_size: int = 100,
+                        max_workers: int = 8) -> Dict:
         """
         解析指定数据集中的文档。
 
         Args:
             dataset_id (str): 数据集 ID
             document_ids (List[str]): 要解析的文档 ID 列表
+            batch_size (int): 单个请求最多携带的 ID 数，超出时拆分为多个请求并发发送，默认 100
+            max_workers (int): 最大并发请求数，默认 8
 
         Returns:
             Dict: API 响应数据
@@ -274,20 +819,78 @@ class RAGflowClient:
         Raises:
             RAGflowAPIError: 如果 API 请求失败
         """
-        url = f"{self.base_url}/api/v1/datasets/{dataset_id}/chunks"
-        data = {"document_ids": document_ids}
-        response = requests.post(url, json=data, headers=self.headers)
-        if not response.ok:
-            raise RAGflowAPIError(f"解析文档失败: {response.status_code} - {response.text}")
-        return response.json()
+        url = self._u["dataset_chunks"].format(dataset_id)
+        result = self._batched("POST", url, "解析文档", "document_ids", document_ids, batch_size, max_workers)
+        self.clear_answer_cache()
+        return result
+
+    def parse_documents_parallel(self, dataset_id: str, document_ids: List[str], max_workers: int = 8,
+                                 wait: bool = True, poll_interval: float = 1.0,
+                                 max_poll_interval: float = 30.0, timeout: Optional[float] = None) -> Dict[str, Dict]:
+        """
+        逐个文档并发提交解析任务，并可等待全部解析结束。
+
+        每个文档在独立的线程中提交解析请求并轮询状态，轮询间隔从 poll_interval 开始按指数退避，
+        最长 max_poll_interval 秒。服务端拒绝解析（code 不为 0）的文档不会轮询，直接返回提交解析的响应。
+
+        Args:
+            dataset_id (str): 数据集 ID
+            document_ids (List[str]): 要解析的文档 ID 列表
+            max_workers (int): 最大并发数，默认 8
+            wait (bool): 是否等待解析结束，默认 True
+            poll_interval (float): 初始轮询间隔（秒），默认 1.0
+            max_poll_interval (float): 最大轮询间隔（秒），默认 30.0
+            timeout (Optional[float]): 等待的总超时时间（秒），None 表示不限
+
+        Returns:
+            Dict[str, Dict]: 文档 ID 到结果的映射；wait 为 True 时是解析结束后的文档信息
+                （可通过 "run" 字段判断成功或失败），否则或提交被拒绝时是提交解析的 API 响应数据
 
-    def stop_parsing_documents(self, dataset_id: str, document_ids: List[str]) -> Dict:
+        Raises:
+            RAGflowAPIError: 如果 API 请求失败或等待超时
+        """
+        if not document_ids:
+            return {}
+        deadline = time.monotonic() + timeout if timeout is not None else None
+
+        def parse_one(document_id: str) -> Dict:
+            response = self.parse_documents(dataset_id, [document_id])
+            # 被拒绝的文档不会开始解析，轮询只会等到超时
+            if not wait or response.get("code", 0) != 0:
+                return response
+            return self._wait_parsed(dataset_id, document_id, poll_interval, max_poll_interval, deadline)
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(document_ids))) as executor:
+            return dict(zip(document_ids, executor.map(parse_one, document_ids)))
+
+    def _wait_parsed(self, dataset_id: str, document_id: str, poll_interval: float,
+                     max_poll_interval: float, deadline: Optional[float]) -> Dict:
+        """轮询文档状态直到解析结束，返回文档信息。"""
+        delay = poll_interval
+        while True:
+            docs = (self.list_documents(dataset_id, id=document_id, use_cache=False).get("data") or {}).get("docs") or []
+            if not docs:
+                raise RAGflowAPIError(f"等待文档解析失败: 文档 {document_id} 不存在")
+            if str(docs[0].get("run")) in _PARSE_FINISHED:
+                self.clear_answer_cache()
+                self.clear_read_cache("/api/v1/datasets")
+                self.clear_read_cache("/api/v1/retrieval")
+                return docs[0]
+            if deadline is not None and time.monotonic() + delay > deadline:
+                raise RAGflowAPIError(f"等待文档解析超时: {document_id}")
+            time.sleep(delay)
+            delay = min(delay * 2, max_poll_interval)
+
+    def stop_parsing_documents(self, dataset_id: str, document_ids: List[str], batch_size: int = 100,
+                               max_workers: int = 8) -> Dict:
         """
         停止解析指定数据集中的文档。
 
         Args:
             dataset_id (str): 数据集 ID
             document_ids (List[str]): 要停止解析的文档 ID 列表
+            batch_size (int): 单个请求最多携带的 ID 数，超出时拆分为多个请求并发发送，默认 100
+            max_workers (int): 最大并发请求数，默认 8
 
         Returns:
             Dict: API 响应数据
@@ -295,12 +898,10 @@ class RAGflowClient:
         Raises:
             RAGflowAPIError: 如果 API 请求失败
         """
-        url = f"{self.base_url}/api/v1/datasets/{dataset_id}/chunks"
-        data = {"document_ids": document_ids}
-        response = requests.delete(url, json=data, headers=self.headers)
-        if not response.ok:
-            raise RAGflowAPIError(f"停止解析文档失败: {response.status_code} - {response.text}")
-        return response.json()
+        url = self._u["dataset_chunks"].format(dataset_id)
+        result = self._batched("DELETE", url, "停止解析文档", "document_ids", document_ids, batch_size, max_workers)
+        self.clear_answer_cache()
+        return result
 
     # 分块管理
     def add_chunk(self, dataset_id: str, document_id: str, content: str,
@@ -320,15 +921,46 @@ class RAGflowClient:
         Raises:
             RAGflowAPIError: 如果 API 请求失败
         """
-        url = f"{self.base_url}/api/v1/datasets/{dataset_id}/documents/{document_id}/chunks"
+        url = self._u["chunks"].format(dataset_id, document_id)
         data = {"content": content, "important_keywords": important_keywords or []}
-        response = requests.post(url, json=data, headers=self.headers)
-        if not response.ok:
-            raise RAGflowAPIError(f"添加分块失败: {response.status_code} - {response.text}")
-        return response.json()
+        result = self._create(url, "添加分块", data)
+        self.clear_answer_cache()
+        return result
+
+    def add_chunks_batch(self, dataset_id: str, document_id: str, contents: List[str],
+                         important_keywords: Optional[List[Optional[List[str]]]] = None,
+                         max_workers: int = 8) -> List[Dict]:
+        """
+        批量添加分块到指定文档。
+
+        RAGflow 没有批量添加分块的接口，这里通过共享连接池并发发送 add_chunk 请求，
+        总耗时约为单次请求的 len(contents) / max_workers 倍。
+
+        Args:
+            dataset_id (str): 数据集 ID
+            document_id (str): 文档 ID
+            contents (List[str]): 分块内容列表
+            important_keywords (Optional[List[Optional[List[str]]]]): 与 contents 一一对应的重要关键词列表
+            max_workers (int): 最大并发请求数，默认 8
+
+        Returns:
+            List[Dict]: 与 contents 顺序一致的 API 响应数据
+
+        Raises:
+            RAGflowAPIError: 如果任一 API 请求失败
+        """
+        keywords = important_keywords or [None] * len(contents)
+        if len(keywords) != len(contents):
+            raise ValueError("important_keywords 的长度必须与 contents 一致")
+        if not contents:
+            return []
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(contents))) as executor:
+            return list(executor.map(lambda args: self.add_chunk(dataset_id, document_id, *args),
+                                     zip(contents, keywords)))
 
     def list_chunks(self, dataset_id: str, document_id: str, keywords: Optional[str] = None,
-                   page: int = 1, page_size: int = 1024, id: Optional[str] = None) -> Dict:
+                   page: int = 1, page_size: int = 1024, id: Optional[str] = None,
+                   use_cache: bool = True) -> Dict:
         """
         列出指定文档中的分块。
 
@@ -339,6 +971,7 @@ class RAGflowClient:
             page (int): 页码，默认 1
             page_size (int): 每页数量，默认 1024
             id (Optional[str]): 分块 ID 过滤
+            use_cache (bool): 是否使用只读响应缓存，默认 True
 
         Returns:
             Dict: API 响应数据
@@ -346,18 +979,40 @@ class RAGflowClient:
         Raises:
             RAGflowAPIError: 如果 API 请求失败
         """
-        url = f"{self.base_url}/api/v1/datasets/{dataset_id}/documents/{document_id}/chunks"
+        url = self._u["chunks"].format(dataset_id, document_id)
         params = {"page": page, "page_size": page_size}
         if keywords:
             params["keywords"] = keywords
         if id:
             params["id"] = id
-        response = requests.get(url, params=params, headers=self.headers)
-        if not response.ok:
-            raise RAGflowAPIError(f"列出分块失败: {response.status_code} - {response.text}")
-        return response.json()
+        return self._request("GET", url, "列出分块", use_cache=use_cache, params=params)
+
+    def iter_all_chunks(self, dataset_id: str, document_id: str, page_size: int = 1024, max_workers: int = 8,
+                        **filters) -> Iterator[Dict]:
+        """
+        逐个返回指定文档中的所有分块，自动翻页。
 
-    def delete_chunks(self, dataset_id: str, document_id: str, chunk_ids: List[str]) -> Dict:
+        先获取第一页得到分块总数，其余页通过线程池在共享连接池上并发获取，按页码顺序返回。
+
+        Args:
+            dataset_id (str): 数据集 ID
+            document_id (str): 文档 ID
+            page_size (int): 每页数量，默认 1024
+            max_workers (int): 最大并发请求数，默认 8
+            **filters: 传递给 list_chunks 的其他参数，例如 keywords
+
+        Yields:
+            Dict: 分块信息
+
+        Raises:
+            RAGflowAPIError: 如果 API 请求失败
+        """
+        return self._iter_pages(
+            lambda page: self.list_chunks(dataset_id, document_id, page=page, page_size=page_size, **filters),
+            "列出分块", "chunks", page_size, max_workers)
+
+    def delete_chunks(self, dataset_id: str, document_id: str, chunk_ids: List[str], batch_size: int = 100,
+                      max_workers: int = 8) -> Dict:
         """
         删除指定文档中的分块。
 
@@ -365,6 +1020,8 @@ class RAGflowClient:
             dataset_id (str): 数据集 ID
             document_id (str): 文档 ID
             chunk_ids (List[str]): 要删除的分块 ID 列表
+            batch_size (int): 单个请求最多携带的 ID 数，超出时拆分为多个请求并发发送，默认 100
+            max_workers (int): 最大并发请求数，默认 8
 
         Returns:
             Dict: API 响应数据
@@ -372,12 +1029,10 @@ class RAGflowClient:
         Raises:
             RAGflowAPIError: 如果 API 请求失败
         """
-        url = f"{self.base_url}/api/v1/datasets/{dataset_id}/documents/{document_id}/chunks"
-        data = {"chunk_ids": chunk_ids}
-        response = requests.delete(url, json=data, headers=self.headers)
-        if not response.ok:
-            raise RAGflowAPIError(f"删除分块失败: {response.status_code} - {response.text}")
-        return response.json()
+        url = self._u["chunks"].format(dataset_id, document_id)
+        result = self._batched("DELETE", url, "删除分块", "chunk_ids", chunk_ids, batch_size, max_workers)
+        self.clear_answer_cache()
+        return result
 
     def update_chunk(self, dataset_id: str, document_id: str, chunk_id: str,
                     content: Optional[str] = None, important_keywords: Optional[List[str]] = None,
@@ -399,21 +1054,24 @@ class RAGflowClient:
         Raises:
             RAGflowAPIError: 如果 API 请求失败
         """
-        url = f"{self.base_url}/api/v1/datasets/{dataset_id}/documents/{document_id}/chunks/{chunk_id}"
-        data = {k: v for k, v in {"content": content, "important_keywords": important_keywords, "available": available}.items() if v is not None}
-        response = requests.put(url, json=data, headers=self.headers)
-        if not response.ok:
-            raise RAGflowAPIError(f"更新分块失败: {response.status_code} - {response.text}")
-        return response.json()
+        url = self._u["chunk"].format(dataset_id, document_id, chunk_id)
+        data = compact(content=content, important_keywords=important_keywords, available=available)
+        result = self._request("PUT", url, "更新分块", json=data)
+        self.clear_answer_cache()
+        return result
 
     def retrieve_chunks(self, question: str, dataset_ids: Optional[List[str]] = None,
                        document_ids: Optional[List[str]] = None, page: int = 1, page_size: int = 30,
                        similarity_threshold: float = 0.2, vector_similarity_weight: float = 0.3,
                        top_k: int = 1024, rerank_id: Optional[str] = None, keyword: bool = False,
-                       highlight: bool = False) -> Dict:
+                       highlight: bool = False, use_cache: bool = True,
+                       cache_ttl: Optional[float] = None) -> Dict:
         """
         从指定数据集中检索分块。
 
+        配置了 retrieval_semantic_cache 时，其他检索参数相同且问题语义足够相近（余弦相似度不低于其
+        similarity_threshold）的调用直接返回之前的检索结果，不再请求服务端。
+
         Args:
             question (str): 用户查询
             dataset_ids (Optional[List[str]]): 数据集 ID 列表
@@ -426,6 +1084,8 @@ class RAGflowClient:
             rerank_id (Optional[str]): 重排模型 ID
             keyword (bool): 是否启用关键词匹配，默认 False
             highlight (bool): 是否高亮匹配项，默认 False
+            use_cache (bool): 是否使用只读响应缓存，默认 True
+            cache_ttl (Optional[float]): 结果在持久化缓存（response_cache）中的存活时间（秒），默认使用其 ttl
 
         Returns:
             Dict: API 响应数据
@@ -433,7 +1093,7 @@ class RAGflowClient:
         Raises:
             RAGflowAPIError: 如果 API 请求失败
         """
-        url = f"{self.base_url}/api/v1/retrieval"
+        url = self._u["retrieval"]
         data = {
             "question": question,
             "dataset_ids": dataset_ids or [],
@@ -447,10 +1107,23 @@ class RAGflowClient:
             "keyword": keyword,
             "highlight": highlight
         }
-        response = requests.post(url, json=data, headers=self.headers)
-        if not response.ok:
-            raise RAGflowAPIError(f"检索分块失败: {response.status_code} - {response.text}")
-        return response.json()
+        semantic = self.retrieval_semantic_cache if use_cache else None
+        if semantic is None:
+            return self._request("POST", url, "检索分块", read_only=True, use_cache=use_cache, persist=True,
+                                 cache_ttl=cache_ttl, json=data)
+        # 除问题外的检索参数都相同时才允许按语义复用结果
+        scope = tuple((key, tuple(sorted(value)) if isinstance(value, list) else value)
+                      for key, value in data.items() if key != "question")
+        question = _normalize_question(question)
+        entry = semantic.lookup(scope, question)
+        self._metrics.record_cache("retrieval_semantic", entry is not None)
+        if entry is not None:
+            return copy.deepcopy(entry.value)
+        result = self._request("POST", url, "检索分块", read_only=True, persist=True, cache_ttl=cache_ttl,
+                               json=data)
+        if result.get("code") == 0:
+            semantic.add(scope, question, copy.deepcopy(result), evidence=())
+        return result
 
     # 聊天助手管理
     def create_chat(self, name: str, avatar: Optional[str] = None, dataset_ids: Optional[List[str]] = None,
@@ -471,7 +1144,7 @@ class RAGflowClient:
         Raises:
             RAGflowAPIError: 如果 API 请求失败
         """
-        url = f"{self.base_url}/api/v1/chats"
+        url = self._u["chats"]
         data = {
             "name": name,
             "avatar": avatar,
@@ -479,10 +1152,7 @@ class RAGflowClient:
             "llm": llm or {},
             "prompt": prompt or {}
         }
-        response = requests.post(url, json=data, headers=self.headers)
-        if not response.ok:
-            raise RAGflowAPIError(f"创建聊天助手失败: {response.status_code} - {response.text}")
-        return response.json()
+        return self._create(url, "创建聊天助手", data)
 
     def update_chat(self, chat_id: str, name: Optional[str] = None, avatar: Optional[str] = None,
                    dataset_ids: Optional[List[str]] = None, llm: Optional[Dict] = None,
@@ -504,19 +1174,20 @@ class RAGflowClient:
         Raises:
             RAGflowAPIError: 如果 API 请求失败
         """
-        url = f"{self.base_url}/api/v1/chats/{chat_id}"
-        data = {k: v for k, v in {"name": name, "avatar": avatar, "dataset_ids": dataset_ids, "llm": llm, "prompt": prompt}.items() if v is not None}
-        response = requests.put(url, json=data, headers=self.headers)
-        if not response.ok:
-            raise RAGflowAPIError(f"更新聊天助手失败: {response.status_code} - {response.text}")
-        return response.json()
+        url = self._u["chat"].format(chat_id)
+        data = compact(name=name, avatar=avatar, dataset_ids=dataset_ids, llm=llm, prompt=prompt)
+        result = self._request("PUT", url, "更新聊天助手", json=data)
+        self.clear_answer_cache()
+        return result
 
-    def delete_chats(self, ids: List[str]) -> Dict:
+    def delete_chats(self, ids: List[str], batch_size: int = 100, max_workers: int = 8) -> Dict:
         """
         删除指定聊天助手。
 
         Args:
             ids (List[str]): 要删除的聊天助手 ID 列表
+            batch_size (int): 单个请求最多携带的 ID 数，超出时拆分为多个请求并发发送，默认 100
+            max_workers (int): 最大并发请求数，默认 8
 
         Returns:
             Dict: API 响应数据
@@ -524,15 +1195,14 @@ class RAGflowClient:
         Raises:
             RAGflowAPIError: 如果 API 请求失败
         """
-        url = f"{self.base_url}/api/v1/chats"
-        data = {"ids": ids}
-        response = requests.delete(url, json=data, headers=self.headers)
-        if not response.ok:
-            raise RAGflowAPIError(f"删除聊天助手失败: {response.status_code} - {response.text}")
-        return response.json()
+        url = self._u["chats"]
+        result = self._batched("DELETE", url, "删除聊天助手", "ids", ids, batch_size, max_workers)
+        self.clear_answer_cache()
+        return result
 
     def list_chats(self, page: int = 1, page_size: int = 30, orderby: str = "create_time",
-                  desc: bool = True, name: Optional[str] = None, id: Optional[str] = None) -> Dict:
+                  desc: bool = True, name: Optional[str] = None, id: Optional[str] = None,
+                  use_cache: bool = True) -> Dict:
         """
         列出聊天助手。
 
@@ -543,6 +1213,7 @@ class RAGflowClient:
             desc (bool): 是否降序，默认 True
             name (Optional[str]): 聊天助手名称过滤
             id (Optional[str]): 聊天助手 ID 过滤
+            use_cache (bool): 是否使用只读响应缓存，默认 True
 
         Returns:
             Dict: API 响应数据
@@ -550,16 +1221,13 @@ class RAGflowClient:
         Raises:
             RAGflowAPIError: 如果 API 请求失败
         """
-        url = f"{self.base_url}/api/v1/chats"
+        url = self._u["chats"]
         params = {"page": page, "page_size": page_size, "orderby": orderby, "desc": str(desc).lower()}
         if name:
             params["name"] = name
         if id:
             params["id"] = id
-        response = requests.get(url, params=params, headers=self.headers)
-        if not response.ok:
-            raise RAGflowAPIError(f"列出聊天助手失败: {response.status_code} - {response.text}")
-        return response.json()
+        return self._request("GET", url, "列出聊天助手", use_cache=use_cache, params=params)
 
     # 会话管理
     def create_session(self, chat_id: str, name: str, user_id: Optional[str] = None) -> Dict:
@@ -577,14 +1245,11 @@ class RAGflowClient:
         Raises:
             RAGflowAPIError: 如果 API 请求失败
         """
-        url = f"{self.base_url}/api/v1/chats/{chat_id}/sessions"
+        url = self._u["sessions"].format(chat_id)
         data = {"name": name}
         if user_id:
             data["user_id"] = user_id
-        response = requests.post(url, json=data, headers=self.headers)
-        if not response.ok:
-            raise RAGflowAPIError(f"创建会话失败: {response.status_code} - {response.text}")
-        return response.json()
+        return self._create(url, "创建会话", data)
 
     def update_session(self, chat_id: str, session_id: str, name: Optional[str] = None,
                       user_id: Optional[str] = None) -> Dict:
@@ -603,16 +1268,13 @@ class RAGflowClient:
         Raises:
             RAGflowAPIError: 如果 API 请求失败
         """
-        url = f"{self.base_url}/api/v1/chats/{chat_id}/sessions/{session_id}"
-        data = {k: v for k, v in {"name": name, "user_id": user_id}.items() if v is not None}
-        response = requests.put(url, json=data, headers=self.headers)
-        if not response.ok:
-            raise RAGflowAPIError(f"更新会话失败: {response.status_code} - {response.text}")
-        return response.json()
+        url = self._u["session"].format(chat_id, session_id)
+        data = compact(name=name, user_id=user_id)
+        return self._request("PUT", url, "更新会话", json=data)
 
     def list_sessions(self, chat_id: str, page: int = 1, page_size: int = 30,
                      orderby: str = "create_time", desc: bool = True, name: Optional[str] = None,
-                     id: Optional[str] = None, user_id: Optional[str] = None) -> Dict:
+                     id: Optional[str] = None, user_id: Optional[str] = None, use_cache: bool = True) -> Dict:
         """
         列出聊天助手的会话。
 
@@ -625,6 +1287,7 @@ class RAGflowClient:
             name (Optional[str]): 会话名称过滤
             id (Optional[str]): 会话 ID 过滤
             user_id (Optional[str]): 用户 ID 过滤
+            use_cache (bool): 是否使用只读响应缓存，默认 True
 
         Returns:
             Dict: API 响应数据
@@ -632,7 +1295,7 @@ class RAGflowClient:
         Raises:
             RAGflowAPIError: 如果 API 请求失败
         """
-        url = f"{self.base_url}/api/v1/chats/{chat_id}/sessions"
+        url = self._u["sessions"].format(chat_id)
         params = {"page": page, "page_size": page_size, "orderby": orderby, "desc": str(desc).lower()}
         if name:
             params["name"] = name
@@ -640,18 +1303,18 @@ class RAGflowClient:
             params["id"] = id
         if user_id:
             params["user_id"] = user_id
-        response = requests.get(url, params=params, headers=self.headers)
-        if not response.ok:
-            raise RAGflowAPIError(f"列出会话失败: {response.status_code} - {response.text}")
-        return response.json()
+        return self._request("GET", url, "列出会话", use_cache=use_cache, params=params)
 
-    def delete_sessions(self, chat_id: str, ids: List[str]) -> Dict:
+    def delete_sessions(self, chat_id: str, ids: List[str], batch_size: int = 100,
+                        max_workers: int = 8) -> Dict:
         """
         删除聊天助手的会话。
 
         Args:
             chat_id (str): 聊天助手 ID
             ids (List[str]): 要删除的会话 ID 列表
+            batch_size (int): 单个请求最多携带的 ID 数，超出时拆分为多个请求并发发送，默认 100
+            max_workers (int): 最大并发请求数，默认 8
 
         Returns:
             Dict: API 响应数据
@@ -659,41 +1322,128 @@ class RAGflowClient:
         Raises:
             RAGflowAPIError: 如果 API 请求失败
         """
-        url = f"{self.base_url}/api/v1/chats/{chat_id}/sessions"
-        data = {"ids": ids}
-        response = requests.delete(url, json=data, headers=self.headers)
-        if not response.ok:
-            raise RAGflowAPIError(f"删除会话失败: {response.status_code} - {response.text}")
-        return response.json()
+        url = self._u["sessions"].format(chat_id)
+        return self._batched("DELETE", url, "删除会话", "ids", ids, batch_size, max_workers)
 
     def converse_with_chat(self, chat_id: str, question: str, stream: bool = True,
-                         session_id: Optional[str] = None, user_id: Optional[str] = None) -> Dict:
+                         session_id: Optional[str] = None, user_id: Optional[str] = None,
+                         use_cache: bool = True) -> Union[Dict, EventStream]:
         """
         与聊天助手进行对话。
 
+        stream 为 True 时，收到响应头后立即返回 EventStream，可逐个迭代事件（"answer" 为截至当前已生成的答案），
+        或调用 collect() 得到与非流式调用相同结构的完整响应；流式对话不使用答案缓存。
+
+        非流式调用启用缓存时，同一聊天助手、同一用户下归一化后相同的问题直接返回缓存的答案，不再请求服务端生成。
+        缓存按 LRU 淘汰并在 answer_cache_ttl 秒后过期；命中缓存的问答不会写入服务端会话历史。
+        指定 session_id 时答案依赖会话历史，不使用答案缓存。
+        配置了 semantic_cache 时，精确缓存未命中会再查找语义相近的问题，并通过一次检索确认
+        当前问题召回的分块与缓存答案引用的分块足够一致后才返回缓存答案。
+
         Args:
             chat_id (str): 聊天助手 ID
             question (str): 问题
             stream (bool): 是否流式输出，默认 True
             session_id (Optional[str]): 会话 ID
             user_id (Optional[str]): 用户 ID
+            use_cache (bool): 是否使用答案缓存，默认 True
 
         Returns:
-            Dict: API 响应数据
+            Union[Dict, EventStream]: stream 为 False 时为 API 响应数据，否则为事件流
 
         Raises:
             RAGflowAPIError: 如果 API 请求失败
         """
-        url = f"{self.base_url}/api/v1/chats/{chat_id}/completions"
+        url = self._u["chat_completions"].format(chat_id)
         data = {"question": question, "stream": stream}
         if session_id:
             data["session_id"] = session_id
         if user_id:
             data["user_id"] = user_id
-        response = requests.post(url, json=data, headers=self.headers)
+        if stream:
+            return self._stream(url, "与聊天助手对话", data)
+        # 多轮对话的答案依赖会话历史，只缓存不指定会话的提问
+        cache_key = (chat_id, user_id, _normalize_question(question)) if use_cache and not session_id else None
+        if cache_key is not None:
+            cached = self._answer_cache.get(cache_key)
+            self._metrics.record_cache("answer", cached is not None)
+            if cached is not None:
+                return copy.deepcopy(cached)
+            if self.semantic_cache is not None:
+                cached = self._semantic_lookup(cache_key[:2], cache_key[2])
+                if cached is not None:
+                    self._answer_cache.set(cache_key, cached)
+                    return copy.deepcopy(cached)
+        if cache_key is None:
+            return self._request("POST", url, "与聊天助手对话", json=data)
+
+        def ask() -> Dict:
+            result = self._request("POST", url, "与聊天助手对话", json=data)
+            if result.get("code") == 0:
+                self._answer_cache.set(cache_key, copy.deepcopy(result))
+                if self.semantic_cache is not None:
+                    self._semantic_store(cache_key[:2], cache_key[2], result)
+            return result
+
+        # 同一会话、同一用户的相同问题并发请求时只生成一次答案；不同会话的历史不同，不能合并
+        return self._inflight.do(("completions", chat_id, session_id, user_id, cache_key[2]), ask)
+
+    def converse_with_chat_stream(self, chat_id: str, question: str, session_id: Optional[str] = None,
+                                  user_id: Optional[str] = None) -> EventStream:
+        """
+        以流式方式与聊天助手对话，边接收边返回事件，无需等待完整答案生成。
+
+        等同于 converse_with_chat(..., stream=True)。每个事件的 "answer" 为截至当前已生成的答案，
+        最后一个事件带有完整答案及 "reference"。流式对话不使用答案缓存。
+
+        Args:
+            chat_id (str): 聊天助手 ID
+            question (str): 问题
+            session_id (Optional[str]): 会话 ID
+            user_id (Optional[str]): 用户 ID
+
+        Returns:
+            EventStream: 事件流
+
+        Raises:
+            RAGflowAPIError: 如果 API 请求失败
+        """
+        return self.converse_with_chat(chat_id, question, stream=True, session_id=session_id, user_id=user_id)
+
+    def _stream(self, url: str, action: str, data: Dict) -> EventStream:
+        """发送流式对话请求，收到响应头后即返回事件流，响应体随迭代逐步读取。"""
+        response = self._session.post(url, data=dumps(data), stream=True, timeout=self.timeout)
+        self._metrics.observe_request(action, response.elapsed.total_seconds())
+        # 对话会写入会话历史
+        self._invalidate_reads(url)
         if not response.ok:
-            raise RAGflowAPIError(f"与聊天助手对话失败: {response.status_code} - {response.text}")
-        return response.json()
+            with response:
+                raise RAGflowAPIError(f"{action}失败: {response.status_code} - {response.text}")
+        return EventStream(response.iter_lines(), response.close)
+
+    def _semantic_lookup(self, scope: Tuple[str, Optional[str]], question: str) -> Optional[Dict]:
+        """在 (聊天助手 ID, 用户 ID) 作用域的语义缓存中查找近似问题，并校验证据一致性。"""
+        from .semantic_cache import jaccard
+
+        entry = self.semantic_cache.lookup(scope, question)
+        if entry is not None:
+            retrieval = self.retrieve_chunks(question, dataset_ids=sorted(entry.scopes),
+                                             page_size=len(entry.evidence), use_cache=False)
+            current = {chunk.get("id") for chunk in (retrieval.get("data") or {}).get("chunks", [])}
+            if jaccard(entry.evidence, current) < self.semantic_cache.evidence_threshold:
+                entry = None
+        self._metrics.record_cache("semantic", entry is not None)
+        return entry.value if entry is not None else None
+
+    def _semantic_store(self, scope: Tuple[str, Optional[str]], question: str, result: Dict) -> None:
+        """将答案及其引用的分块写入语义缓存；没有引用证据的答案无法校验，不写入。"""
+        data = result.get("data")
+        reference = data.get("reference") if isinstance(data, dict) else None
+        chunks = (reference or {}).get("chunks") or []
+        evidence = {chunk.get("id") or chunk.get("chunk_id") for chunk in chunks} - {None}
+        datasets = {chunk.get("dataset_id") or chunk.get("kb_id") for chunk in chunks} - {None}
+        if evidence and datasets:
+            self.semantic_cache.add(scope, question, copy.deepcopy(result), evidence, datasets)
 
     # Agent 管理
     def create_agent_session(self, agent_id: str, params: Optional[Dict] = None, user_id: Optional[str] = None) -> Dict:
@@ -711,21 +1461,20 @@ class RAGflowClient:
         Raises:
             RAGflowAPIError: 如果 API 请求失败
         """
-        url = f"{self.base_url}/api/v1/agents/{agent_id}/sessions"
+        url = self._u["agent_sessions"].format(agent_id)
         data = params or {}
         if user_id:
             data["user_id"] = user_id
-        response = requests.post(url, json=data, headers=self.headers)
-        if not response.ok:
-            raise RAGflowAPIError(f"创建代理会话失败: {response.status_code} - {response.text}")
-        return response.json()
+        return self._create(url, "创建代理会话", data)
 
     def converse_with_agent(self, agent_id: str, question: str, stream: bool = True,
                           session_id: Optional[str] = None, user_id: Optional[str] = None,
-                          extra_params: Optional[Dict] = None) -> Dict:
+                          extra_params: Optional[Dict] = None) -> Union[Dict, EventStream]:
         """
         与代理进行对话。
 
+        stream 为 True 时，收到响应头后立即返回 EventStream，可逐个迭代事件，或调用 collect() 得到完整响应。
+
         Args:
             agent_id (str): 代理 ID
             question (str): 问题
@@ -735,12 +1484,12 @@ class RAGflowClient:
             extra_params (Optional[Dict]): 额外的参数
 
         Returns:
-            Dict: API 响应数据
+            Union[Dict, EventStream]: stream 为 False 时为 API 响应数据，否则为事件流
 
         Raises:
             RAGflowAPIError: 如果 API 请求失败
         """
-        url = f"{self.base_url}/api/v1/agents/{agent_id}/completions"
+        url = self._u["agent_completions"].format(agent_id)
         data = {"question": question, "stream": stream}
         if session_id:
             data["session_id"] = session_id
@@ -748,14 +1497,14 @@ class RAGflowClient:
             data["user_id"] = user_id
         if extra_params:
             data.update(extra_params)
-        response = requests.post(url, json=data, headers=self.headers)
-        if not response.ok:
-            raise RAGflowAPIError(f"与代理对话失败: {response.status_code} - {response.text}")
-        return response.json()
+        if stream:
+            return self._stream(url, "与代理对话", data)
+        return self._request("POST", url, "与代理对话", json=data)
 
     def list_agent_sessions(self, agent_id: str, page: int = 1, page_size: int = 30,
                            orderby: str = "create_time", desc: bool = True,
-                           id: Optional[str] = None, user_id: Optional[str] = None) -> Dict:
+                           id: Optional[str] = None, user_id: Optional[str] = None,
+                           use_cache: bool = True) -> Dict:
         """
         列出代理的会话。
 
@@ -767,6 +1516,7 @@ class RAGflowClient:
             desc (bool): 是否降序，默认 True
             id (Optional[str]): 会话 ID 过滤
             user_id (Optional[str]): 用户 ID 过滤
+            use_cache (bool): 是否使用只读响应缓存，默认 True
 
         Returns:
             Dict: API 响应数据
@@ -774,19 +1524,17 @@ class RAGflowClient:
         Raises:
             RAGflowAPIError: 如果 API 请求失败
         """
-        url = f"{self.base_url}/api/v1/agents/{agent_id}/sessions"
+        url = self._u["agent_sessions"].format(agent_id)
         params = {"page": page, "page_size": page_size, "orderby": orderby, "desc": str(desc).lower()}
         if id:
             params["id"] = id
         if user_id:
             params["user_id"] = user_id
-        response = requests.get(url, params=params, headers=self.headers)
-        if not response.ok:
-            raise RAGflowAPIError(f"列出代理会话失败: {response.status_code} - {response.text}")
-        return response.json()
+        return self._request("GET", url, "列出代理会话", use_cache=use_cache, params=params)
 
     def list_agents(self, page: int = 1, page_size: int = 30, orderby: str = "create_time",
-                   desc: bool = True, name: Optional[str] = None, id: Optional[str] = None) -> Dict:
+                   desc: bool = True, name: Optional[str] = None, id: Optional[str] = None,
+                   use_cache: bool = True) -> Dict:
         """
         列出代理。
 
@@ -797,6 +1545,7 @@ class RAGflowClient:
             desc (bool): 是否降序，默认 True
             name (Optional[str]): 代理名称过滤
             id (Optional[str]): 代理 ID 过滤
+            use_cache (bool): 是否使用只读响应缓存，默认 True
 
         Returns:
             Dict: API 响应数据
@@ -804,13 +1553,10 @@ class RAGflowClient:
         Raises:
             RAGflowAPIError: 如果 API 请求失败
         """
-        url = f"{self.base_url}/api/v1/agents"
+        url = self._u["agents"]
         params = {"page": page, "page_size": page_size, "orderby": orderby, "desc": str(desc).lower()}
         if name:
             params["name"] = name
         if id:
             params["id"] = id
-        response = requests.get(url, params=params, headers=self.headers)
-        if not response.ok:
-            raise RAGflowAPIError(f"列出代理失败: {response.status_code} - {response.text}")
-        return response.json()
\ No newline at end of file
+        return self._request("GET", url, "列出代理", use_cache=use_cache, params=params)
\ No newline at end of file
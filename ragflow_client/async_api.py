@@ -0,0 +1,873 @@
+import asyncio
+import importlib.util
+import httpx
+from contextlib import ExitStack
+from typing import List, Dict, Optional, Tuple, Union, Any
+from pathlib import Path
+from . import __version__
+from ._json import dumps, loads
+from ._utils import API_PATHS, compact
+from .exceptions import RAGflowAPIError
+from .streaming import AsyncEventStream
+
+# http2=True 依赖可选的 h2 包，未安装时退回 HTTP/1.1
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+class AsyncRAGflowClient:
+    """
+    RAGflow API 异步客户端，基于 httpx.AsyncClient。
+
+    方法与 RAGflowClient 一一对应，均为协程。相互独立的调用可以通过 asyncio.gather 并发执行，
+    在 HTTP/2 下多个请求复用同一条连接。
+    """
+
+    def __init__(self, base_url: str, api_key: str, http2: bool = True, max_connections: int = 100,
+                 keepalive_expiry: float = 60, timeout: Union[None, float, Tuple[float, float]] = (5, 60)):
+        """
+        初始化 RAGflow 异步客户端。
+
+        Args:
+            base_url (str): RAGflow 服务的基础 URL，例如 'http://localhost:5000'
+            api_key (str): API 密钥，用于身份验证
+            http2 (bool): 是否启用 HTTP/2，默认 True；未安装 h2 时自动退回 HTTP/1.1
+            max_connections (int): 连接池的最大连接数，默认 100
+            keepalive_expiry (float): 空闲连接保持的时间（秒），默认 60
+            timeout (Union[None, float, Tuple[float, float]]): 请求超时（秒），可为 (连接超时, 读取超时)，
+                默认 (5, 60)；None 表示不超时
+        """
+        self.base_url = base_url.rstrip('/')
+        # 预先拼接好完整的 URL 模板，各方法只需填入资源 ID
+        self._u = {name: self.base_url + path for name, path in API_PATHS.items()}
+        self.headers = {
+            'Authorization': f'Bearer {api_key}',
+            'Content-Type': 'application/json'
+        }
+        # Content-Type 由 httpx 按请求体自动设置，multipart 上传才能带上正确的 boundary
+        self._client = httpx.AsyncClient(
+            headers={'Authorization': self.headers['Authorization'],
+                     'User-Agent': f'ragflow-client/{__version__}'},
+            http2=http2 and _HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_connections=max_connections,
+                                max_keepalive_connections=max_connections,
+                                keepalive_expiry=keepalive_expiry),
+            timeout=httpx.Timeout(timeout[1], connect=timeout[0]) if isinstance(timeout, tuple) else timeout,
+        )
+
+    async def aclose(self) -> None:
+        """关闭客户端，释放连接池中的连接。"""
+        await self._client.aclose()
+
+    async def __aenter__(self) -> "AsyncRAGflowClient":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.aclose()
+
+    async def _request(self, method: str, url: str, action: str, **kwargs) -> Dict:
+        """
+        发送请求并解析 JSON 响应。
+
+        Args:
+            method (str): HTTP 方法
+            url (str): 请求 URL
+            action (str): 操作描述，用于错误信息
+            **kwargs: 传递给 httpx 的其他参数
+
+        Returns:
+            Dict: API 响应数据
+
+        Raises:
+            RAGflowAPIError: 如果 API 请求失败
+        """
+        if kwargs.get("json") is not None:
+            # 自行序列化 JSON，以便使用 orjson
+            kwargs["content"] = dumps(kwargs.pop("json"))
+            kwargs["headers"] = {**kwargs.get("headers", {}), "Content-Type": "application/json"}
+        response = await self._client.request(method, url, **kwargs)
+        if response.is_error:
+            raise RAGflowAPIError(f"{action}失败: {response.status_code} - {response.text}")
+        return loads(response.content)
+
+    async def _stream(self, url: str, action: str, data: Dict) -> AsyncEventStream:
+        """发送流式对话请求，收到响应头后即返回事件流，响应体随迭代逐步读取。"""
+        request = self._client.build_request("POST", url, content=dumps(data),
+                                             headers={"Content-Type": "application/json"})
+        response = await self._client.send(request, stream=True)
+        if response.is_error:
+            try:
+                await response.aread()
+                raise RAGflowAPIError(f"{action}失败: {response.status_code} - {response.text}")
+            finally:
+                await response.aclose()
+        return AsyncEventStream(response.aiter_lines(), response.aclose)
+
+    # 数据集管理
+    async def create_dataset(self, name: str, avatar: Optional[str] = None, description: Optional[str] = None,
+                      language: str = "English", embedding_model: str = "BAAI/bge-zh-v1.5",
+                      permission: str = "me", chunk_method: str = "naive",
+                      parser_config: Optional[Dict] = None) -> Dict:
+        """
+        创建一个新的数据集。
+
+        Args:
+            name (str): 数据集的唯一名称
+            avatar (Optional[str]): Base64 编码的头像
+            description (Optional[str]): 数据集描述
+            language (str): 数据集语言，默认 "English"
+            embedding_model (str): 嵌入模型名称，默认 "BAAI/bge-zh-v1.5"
+            permission (str): 访问权限，默认 "me"
+            chunk_method (str): 分块方法，默认 "naive"
+            parser_config (Optional[Dict]): 解析器配置
+
+        Returns:
+            Dict: API 响应数据
+
+        Raises:
+            RAGflowAPIError: 如果 API 请求失败
+        """
+        url = self._u["datasets"]
+        data = {
+            "name": name,
+            "avatar": avatar,
+            "description": description,
+            "language": language,
+            "embedding_model": embedding_model,
+            "permission": permission,
+            "chunk_method": chunk_method,
+            "parser_config": parser_config or {}
+        }
+        return await self._request("POST", url, "创建数据集", json=data)
+
+    async def delete_datasets(self, ids: List[str]) -> Dict:
+        """
+        根据 ID 删除数据集。
+
+        Args:
+            ids (List[str]): 要删除的数据集 ID 列表
+
+        Returns:
+            Dict: API 响应数据
+
+        Raises:
+            RAGflowAPIError: 如果 API 请求失败
+        """
+        url = self._u["datasets"]
+        data = {"ids": list(dict.fromkeys(ids))}
+        return await self._request("DELETE", url, "删除数据集", json=data)
+
+    async def update_dataset(self, dataset_id: str, name: Optional[str] = None,
+                      embedding_model: Optional[str] = None, chunk_method: Optional[str] = None) -> Dict:
+        """
+        更新指定数据集的配置。
+
+        Args:
+            dataset_id (str): 数据集 ID
+            name (Optional[str]): 更新的名称
+            embedding_model (Optional[str]): 更新的嵌入模型
+            chunk_method (Optional[str]): 更新的分块方法
+
+        Returns:
+            Dict: API 响应数据
+
+        Raises:
+            RAGflowAPIError: 如果 API 请求失败
+        """
+        url = self._u["dataset"].format(dataset_id)
+        data = compact(name=name, embedding_model=embedding_model, chunk_method=chunk_method)
+        return await self._request("PUT", url, "更新数据集", json=data)
+
+    async def list_datasets(self, page: int = 1, page_size: int = 30, orderby: str = "create_time",
+                     desc: bool = True, name: Optional[str] = None, id: Optional[str] = None) -> Dict:
+        """
+        列出数据集。
+
+        Args:
+            page (int): 页码，默认 1
+            page_size (int): 每页数量，默认 30
+            orderby (str): 排序字段，默认 "create_time"
+            desc (bool): 是否降序，默认 True
+            name (Optional[str]): 数据集名称过滤
+            id (Optional[str]): 数据集 ID 过滤
+
+        Returns:
+            Dict: API 响应数据
+
+        Raises:
+            RAGflowAPIError: 如果 API 请求失败
+        """
+        url = self._u["datasets"]
+        params = {"page": page, "page_size": page_size, "orderby": orderby, "desc": str(desc).lower()}
+        if name:
+            params["name"] = name
+        if id:
+            params["id"] = id
+        return await self._request("GET", url, "列出数据集", params=params)
+
+    # 文件管理
+    async def upload_documents(self, dataset_id: str, file_paths: List[Union[str, Path]],
+                               batch_size: int = 32) -> Dict:
+        """
+        上传文档到指定数据集。
+
+        所有文件打包为一个 multipart 请求发送；文件数超过 batch_size 时按批次拆分。
+        全部成功时各批次的返回数据按顺序合并到同一个响应中；有批次失败（code 不为 0）时
+        返回第一个失败的批次响应。多个批次时响应的 "batches" 中附有所有批次的响应。
+
+        Args:
+            dataset_id (str): 数据集 ID
+            file_paths (List[Union[str, Path]]): 要上传的文件路径列表
+            batch_size (int): 单个请求最多携带的文件数，默认 32
+
+        Returns:
+            Dict: API 响应数据
+
+        Raises:
+            RAGflowAPIError: 如果 API 请求失败
+        """
+        url = self._u["documents"].format(dataset_id)
+        file_paths = list(file_paths)
+        responses = []
+        for start in range(0, len(file_paths) or 1, batch_size):
+            with ExitStack() as stack:
+                files = [('file', (Path(fp).name, stack.enter_context(open(fp, 'rb'))))
+                         for fp in file_paths[start:start + batch_size]]
+                response = await self._client.post(url, files=files)
+            if response.is_error:
+                raise RAGflowAPIError(f"上传文档失败: {response.status_code} - {response.text}")
+            responses.append(loads(response.content))
+        result = dict(next((response for response in responses if response.get("code", 0) != 0), responses[0]))
+        if len(responses) > 1:
+            if result.get("code", 0) == 0:
+                result["data"] = [doc for response in responses for doc in response.get("data") or []]
+            result["batches"] = responses
+        return result
+
+    async def gather_upload(self, dataset_id: str, file_paths: List[Union[str, Path]],
+                            max_concurrency: int = 8) -> List[Dict]:
+        """
+        逐个文件并发上传到指定数据集，同时进行的上传数不超过 max_concurrency。
+
+        与 upload_documents 的批量请求相比，单个文件失败不会影响其他文件，适合大量文件的导入流水线。
+
+        Args:
+            dataset_id (str): 数据集 ID
+            file_paths (List[Union[str, Path]]): 要上传的文件路径列表
+            max_concurrency (int): 同时进行的最大上传数，默认 8
+
+        Returns:
+            List[Dict]: 与 file_paths 顺序一致的各文件 API 响应数据
+
+        Raises:
+            RAGflowAPIError: 如果任一文件的 API 请求失败（其余上传仍会完成）
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def upload_one(file_path: Union[str, Path]) -> Dict:
+            async with semaphore:
+                return await self.upload_documents(dataset_id, [file_path])
+
+        results = await asyncio.gather(*(upload_one(fp) for fp in file_paths), return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return results
+
+    async def update_document(self, dataset_id: str, document_id: str, name: Optional[str] = None,
+                       chunk_method: Optional[str] = None, parser_config: Optional[Dict] = None) -> Dict:
+        """
+        更新指定文档的配置。
+
+        Args:
+            dataset_id (str): 数据集 ID
+            document_id (str): 文档 ID
+            name (Optional[str]): 更新后的名称
+            chunk_method (Optional[str]): 更新后的分块方法
+            parser_config (Optional[Dict]): 更新后的解析器配置
+
+        Returns:
+            Dict: API 响应数据
+
+        Raises:
+            RAGflowAPIError: 如果 API 请求失败
+        """
+        url = self._u["document"].format(dataset_id, document_id)
+        data = compact(name=name, chunk_method=chunk_method, parser_config=parser_config)
+        return await self._request("PUT", url, "更新文档", json=data)
+
+    async def download_document(self, dataset_id: str, document_id: str, output_path: Union[str, Path]) -> None:
+        """
+        下载指定文档。
+
+        Args:
+            dataset_id (str): 数据集 ID
+            document_id (str): 文档 ID
+            output_path (Union[str, Path]): 保存文件的路径
+
+        Raises:
+            RAGflowAPIError: 如果 API 请求失败
+        """
+        url = self._u["document"].format(dataset_id, document_id)
+        async with self._client.stream("GET", url) as response:
+            if response.is_error:
+                await response.aread()
+                raise RAGflowAPIError(f"下载文档失败: {response.status_code} - {response.text}")
+            with open(output_path, 'wb') as f:
+                async for chunk in response.aiter_bytes(chunk_size=8192):
+                    f.write(chunk)
+
+    async def list_documents(self, dataset_id: str, page: int = 1, page_size: int = 30,
+                      orderby: str = "create_time", desc: bool = True, keywords: Optional[str] = None,
+                      id: Optional[str] = None, name: Optional[str] = None) -> Dict:
+        """
+        列出指定数据集中的文档。
+
+        Args:
+            dataset_id (str): 数据集 ID
+            page (int): 页码，默认 1
+            page_size (int): 每页数量，默认 30
+            orderby (str): 排序字段，默认 "create_time"
+            desc (bool): 是否降序，默认 True
+            keywords (Optional[str]): 标题关键词过滤
+            id (Optional[str]): 文档 ID 过滤
+            name (Optional[str]): 文档名称过滤
+
+        Returns:
+            Dict: API 响应数据
+
+        Raises:
+            RAGflowAPIError: 如果 API 请求失败
+        """
+        url = self._u["documents"].format(dataset_id)
+        params = {"page": page, "page_size": page_size, "orderby": orderby, "desc": str(desc).lower()}
+        if keywords:
+            params["keywords"] = keywords
+        if id:
+            params["id"] = id
+        if name:
+            params["name"] = name
+        return await self._request("GET", url, "列出文档", params=params)
+
+    async def delete_documents(self, dataset_id: str, ids: List[str]) -> Dict:
+        """
+        删除指定数据集中的文档。
+
+        Args:
+            dataset_id (str): 数据集 ID
+            ids (List[str]): 要删除的文档 ID 列表
+
+        Returns:
+            Dict: API 响应数据
+
+        Raises:
+            RAGflowAPIError: 如果 API 请求失败
+        """
+        url = self._u["documents"].format(dataset_id)
+        data = {"ids": list(dict.fromkeys(ids))}
+        return await self._request("DELETE", url, "删除文档", json=data)
+
+    async def parse_documents(self, dataset_id: str, document_ids: List[str]) -> Dict:
+        """
+        解析指定数据集中的文档。
+
+        Args:
+            dataset_id (str): 数据集 ID
+            document_ids (List[str]): 要解析的文档 ID 列表
+
+        Returns:
+            Dict: API 响应数据
+
+        Raises:
+            RAGflowAPIError: 如果 API 请求失败
+        """
+        url = self._u["dataset_chunks"].format(dataset_id)
+        data = {"document_ids": document_ids}
+        return await self._request("POST", url, "解析文档", json=data)
+
+    async def stop_parsing_documents(self, dataset_id: str, document_ids: List[str]) -> Dict:
+        """
+        停止解析指定数据集中的文档。
+
+        Args:
+            dataset_id (str): 数据集 ID
+            document_ids (List[str]): 要停止解析的文档 ID 列表
+
+        Returns:
+            Dict: API 响应数据
+
+        Raises:
+            RAGflowAPIError: 如果 API 请求失败
+        """
+        url = self._u["dataset_chunks"].format(dataset_id)
+        data = {"document_ids": document_ids}
+        return await self._request("DELETE", url, "停止解析文档", json=data)
+
+    # 分块管理
+    async def add_chunk(self, dataset_id: str, document_id: str, content: str,
+                 important_keywords: Optional[List[str]] = None) -> Dict:
+        """
+        添加分块到指定文档。
+
+        Args:
+            dataset_id (str): 数据集 ID
+            document_id (str): 文档 ID
+            content (str): 分块内容
+            important_keywords (Optional[List[str]]): 重要关键词列表
+
+        Returns:
+            Dict: API 响应数据
+
+        Raises:
+            RAGflowAPIError: 如果 API 请求失败
+        """
+        url = self._u["chunks"].format(dataset_id, document_id)
+        data = {"content": content, "important_keywords": important_keywords or []}
+        return await self._request("POST", url, "添加分块", json=data)
+
+    async def list_chunks(self, dataset_id: str, document_id: str, keywords: Optional[str] = None,
+                   page: int = 1, page_size: int = 1024, id: Optional[str] = None) -> Dict:
+        """
+        列出指定文档中的分块。
+
+        Args:
+            dataset_id (str): 数据集 ID
+            document_id (str): 文档 ID
+            keywords (Optional[str]): 内容关键词过滤
+            page (int): 页码，默认 1
+            page_size (int): 每页数量，默认 1024
+            id (Optional[str]): 分块 ID 过滤
+
+        Returns:
+            Dict: API 响应数据
+
+        Raises:
+            RAGflowAPIError: 如果 API 请求失败
+        """
+        url = self._u["chunks"].format(dataset_id, document_id)
+        params = {"page": page, "page_size": page_size}
+        if keywords:
+            params["keywords"] = keywords
+        if id:
+            params["id"] = id
+        return await self._request("GET", url, "列出分块", params=params)
+
+    async def delete_chunks(self, dataset_id: str, document_id: str, chunk_ids: List[str]) -> Dict:
+        """
+        删除指定文档中的分块。
+
+        Args:
+            dataset_id (str): 数据集 ID
+            document_id (str): 文档 ID
+            chunk_ids (List[str]): 要删除的分块 ID 列表
+
+        Returns:
+            Dict: API 响应数据
+
+        Raises:
+            RAGflowAPIError: 如果 API 请求失败
+        """
+        url = self._u["chunks"].format(dataset_id, document_id)
+        data = {"chunk_ids": list(dict.fromkeys(chunk_ids))}
+        return await self._request("DELETE", url, "删除分块", json=data)
+
+    async def update_chunk(self, dataset_id: str, document_id: str, chunk_id: str,
+                    content: Optional[str] = None, important_keywords: Optional[List[str]] = None,
+                    available: Optional[bool] = None) -> Dict:
+        """
+        更新指定分块的内容或配置。
+
+        Args:
+            dataset_id (str): 数据集 ID
+            document_id (str): 文档 ID
+            chunk_id (str): 分块 ID
+            content (Optional[str]): 更新后的内容
+            important_keywords (Optional[List[str]]): 更新后的重要关键词
+            available (Optional[bool]): 更新后的可用性状态
+
+        Returns:
+            Dict: API 响应数据
+
+        Raises:
+            RAGflowAPIError: 如果 API 请求失败
+        """
+        url = self._u["chunk"].format(dataset_id, document_id, chunk_id)
+        data = compact(content=content, important_keywords=important_keywords, available=available)
+        return await self._request("PUT", url, "更新分块", json=data)
+
+    async def retrieve_chunks(self, question: str, dataset_ids: Optional[List[str]] = None,
+                       document_ids: Optional[List[str]] = None, page: int = 1, page_size: int = 30,
+                       similarity_threshold: float = 0.2, vector_similarity_weight: float = 0.3,
+                       top_k: int = 1024, rerank_id: Optional[str] = None, keyword: bool = False,
+                       highlight: bool = False) -> Dict:
+        """
+        从指定数据集中检索分块。
+
+        Args:
+            question (str): 用户查询
+            dataset_ids (Optional[List[str]]): 数据集 ID 列表
+            document_ids (Optional[List[str]]): 文档 ID 列表
+            page (int): 页码，默认 1
+            page_size (int): 每页数量，默认 30
+            similarity_threshold (float): 相似度阈值，默认 0.2
+            vector_similarity_weight (float): 向量相似度权重，默认 0.3
+            top_k (int): 向量计算中使用的分块数，默认 1024
+            rerank_id (Optional[str]): 重排模型 ID
+            keyword (bool): 是否启用关键词匹配，默认 False
+            highlight (bool): 是否高亮匹配项，默认 False
+
+        Returns:
+            Dict: API 响应数据
+
+        Raises:
+            RAGflowAPIError: 如果 API 请求失败
+        """
+        url = self._u["retrieval"]
+        data = {
+            "question": question,
+            "dataset_ids": dataset_ids or [],
+            "document_ids": document_ids or [],
+            "page": page,
+            "page_size": page_size,
+            "similarity_threshold": similarity_threshold,
+            "vector_similarity_weight": vector_similarity_weight,
+            "top_k": top_k,
+            "rerank_id": rerank_id,
+            "keyword": keyword,
+            "highlight": highlight
+        }
+        return await self._request("POST", url, "检索分块", json=data)
+
+    # 聊天助手管理
+    async def create_chat(self, name: str, avatar: Optional[str] = None, dataset_ids: Optional[List[str]] = None,
+                   llm: Optional[Dict] = None, prompt: Optional[Dict] = None) -> Dict:
+        """
+        创建一个聊天助手。
+
+        Args:
+            name (str): 聊天助手名称
+            avatar (Optional[str]): Base64 编码的头像
+            dataset_ids (Optional[List[str]]): 关联的数据集 ID 列表
+            llm (Optional[Dict]): LLM 设置
+            prompt (Optional[Dict]): 提示设置
+
+        Returns:
+            Dict: API 响应数据
+
+        Raises:
+            RAGflowAPIError: 如果 API 请求失败
+        """
+        url = self._u["chats"]
+        data = {
+            "name": name,
+            "avatar": avatar,
+            "dataset_ids": dataset_ids or [],
+            "llm": llm or {},
+            "prompt": prompt or {}
+        }
+        return await self._request("POST", url, "创建聊天助手", json=data)
+
+    async def update_chat(self, chat_id: str, name: Optional[str] = None, avatar: Optional[str] = None,
+                   dataset_ids: Optional[List[str]] = None, llm: Optional[Dict] = None,
+                   prompt: Optional[Dict] = None) -> Dict:
+        """
+        更新指定聊天助手的配置。
+
+        Args:
+            chat_id (str): 聊天助手 ID
+            name (Optional[str]): 更新后的名称
+            avatar (Optional[str]): 更新后的头像
+            dataset_ids (Optional[List[str]]): 更新后的数据集 ID 列表
+            llm (Optional[Dict]): 更新后的 LLM 设置
+            prompt (Optional[Dict]): 更新后的提示设置
+
+        Returns:
+            Dict: API 响应数据
+
+        Raises:
+            RAGflowAPIError: 如果 API 请求失败
+        """
+        url = self._u["chat"].format(chat_id)
+        data = compact(name=name, avatar=avatar, dataset_ids=dataset_ids, llm=llm, prompt=prompt)
+        return await self._request("PUT", url, "更新聊天助手", json=data)
+
+    async def delete_chats(self, ids: List[str]) -> Dict:
+        """
+        删除指定聊天助手。
+
+        Args:
+            ids (List[str]): 要删除的聊天助手 ID 列表
+
+        Returns:
+            Dict: API 响应数据
+
+        Raises:
+            RAGflowAPIError: 如果 API 请求失败
+        """
+        url = self._u["chats"]
+        data = {"ids": list(dict.fromkeys(ids))}
+        return await self._request("DELETE", url, "删除聊天助手", json=data)
+
+    async def list_chats(self, page: int = 1, page_size: int = 30, orderby: str = "create_time",
+                  desc: bool = True, name: Optional[str] = None, id: Optional[str] = None) -> Dict:
+        """
+        列出聊天助手。
+
+        Args:
+            page (int): 页码，默认 1
+            page_size (int): 每页数量，默认 30
+            orderby (str): 排序字段，默认 "create_time"
+            desc (bool): 是否降序，默认 True
+            name (Optional[str]): 聊天助手名称过滤
+            id (Optional[str]): 聊天助手 ID 过滤
+
+        Returns:
+            Dict: API 响应数据
+
+        Raises:
+            RAGflowAPIError: 如果 API 请求失败
+        """
+        url = self._u["chats"]
+        params = {"page": page, "page_size": page_size, "orderby": orderby, "desc": str(desc).lower()}
+        if name:
+            params["name"] = name
+        if id:
+            params["id"] = id
+        return await self._request("GET", url, "列出聊天助手", params=params)
+
+    # 会话管理
+    async def create_session(self, chat_id: str, name: str, user_id: Optional[str] = None) -> Dict:
+        """
+        创建与聊天助手的会话。
+
+        Args:
+            chat_id (str): 聊天助手 ID
+            name (str): 会话名称
+            user_id (Optional[str]): 用户定义的 ID
+
+        Returns:
+            Dict: API 响应数据
+
+        Raises:
+            RAGflowAPIError: 如果 API 请求失败
+        """
+        url = self._u["sessions"].format(chat_id)
+        data = {"name": name}
+        if user_id:
+            data["user_id"] = user_id
+        return await self._request("POST", url, "创建会话", json=data)
+
+    async def update_session(self, chat_id: str, session_id: str, name: Optional[str] = None,
+                      user_id: Optional[str] = None) -> Dict:
+        """
+        更新聊天助手的会话。
+
+        Args:
+            chat_id (str): 聊天助手 ID
+            session_id (str): 会话 ID
+            name (Optional[str]): 更新后的名称
+            user_id (Optional[str]): 更新后的用户 ID
+
+        Returns:
+            Dict: API 响应数据
+
+        Raises:
+            RAGflowAPIError: 如果 API 请求失败
+        """
+        url = self._u["session"].format(chat_id, session_id)
+        data = compact(name=name, user_id=user_id)
+        return await self._request("PUT", url, "更新会话", json=data)
+
+    async def list_sessions(self, chat_id: str, page: int = 1, page_size: int = 30,
+                     orderby: str = "create_time", desc: bool = True, name: Optional[str] = None,
+                     id: Optional[str] = None, user_id: Optional[str] = None) -> Dict:
+        """
+        列出聊天助手的会话。
+
+        Args:
+            chat_id (str): 聊天助手 ID
+            page (int): 页码，默认 1
+            page_size (int): 每页数量，默认 30
+            orderby (str): 排序字段，默认 "create_time"
+            desc (bool): 是否降序，默认 True
+            name (Optional[str]): 会话名称过滤
+            id (Optional[str]): 会话 ID 过滤
+            user_id (Optional[str]): 用户 ID 过滤
+
+        Returns:
+            Dict: API 响应数据
+
+        Raises:
+            RAGflowAPIError: 如果 API 请求失败
+        """
+        url = self._u["sessions"].format(chat_id)
+        params = {"page": page, "page_size": page_size, "orderby": orderby, "desc": str(desc).lower()}
+        if name:
+            params["name"] = name
+        if id:
+            params["id"] = id
+        if user_id:
+            params["user_id"] = user_id
+        return await self._request("GET", url, "列出会话", params=params)
+
+    async def delete_sessions(self, chat_id: str, ids: List[str]) -> Dict:
+        """
+        删除聊天助手的会话。
+
+        Args:
+            chat_id (str): 聊天助手 ID
+            ids (List[str]): 要删除的会话 ID 列表
+
+        Returns:
+            Dict: API 响应数据
+
+        Raises:
+            RAGflowAPIError: 如果 API 请求失败
+        """
+        url = self._u["sessions"].format(chat_id)
+        data = {"ids": list(dict.fromkeys(ids))}
+        return await self._request("DELETE", url, "删除会话", json=data)
+
+    async def converse_with_chat(self, chat_id: str, question: str, stream: bool = True,
+                         session_id: Optional[str] = None,
+                         user_id: Optional[str] = None) -> Union[Dict, AsyncEventStream]:
+        """
+        与聊天助手进行对话。
+
+        stream 为 True 时，收到响应头后立即返回 AsyncEventStream，可通过 async for 逐个获取事件，
+        或 await collect() 得到与非流式调用相同结构的完整响应。
+
+        Args:
+            chat_id (str): 聊天助手 ID
+            question (str): 问题
+            stream (bool): 是否流式输出，默认 True
+            session_id (Optional[str]): 会话 ID
+            user_id (Optional[str]): 用户 ID
+
+        Returns:
+            Union[Dict, AsyncEventStream]: stream 为 False 时为 API 响应数据，否则为事件流
+
+        Raises:
+            RAGflowAPIError: 如果 API 请求失败
+        """
+        url = self._u["chat_completions"].format(chat_id)
+        data = {"question": question, "stream": stream}
+        if session_id:
+            data["session_id"] = session_id
+        if user_id:
+            data["user_id"] = user_id
+        if stream:
+            return await self._stream(url, "与聊天助手对话", data)
+        return await self._request("POST", url, "与聊天助手对话", json=data)
+
+    # Agent 管理
+    async def create_agent_session(self, agent_id: str, params: Optional[Dict] = None, user_id: Optional[str] = None) -> Dict:
+        """
+        创建与代理的会话。
+
+        Args:
+            agent_id (str): 代理 ID
+            params (Optional[Dict]): 开始组件的参数
+            user_id (Optional[str]): 用户定义的 ID
+
+        Returns:
+            Dict: API 响应数据
+
+        Raises:
+            RAGflowAPIError: 如果 API 请求失败
+        """
+        url = self._u["agent_sessions"].format(agent_id)
+        data = params or {}
+        if user_id:
+            data["user_id"] = user_id
+        return await self._request("POST", url, "创建代理会话", json=data)
+
+    async def converse_with_agent(self, agent_id: str, question: str, stream: bool = True,
+                          session_id: Optional[str] = None, user_id: Optional[str] = None,
+                          extra_params: Optional[Dict] = None) -> Union[Dict, AsyncEventStream]:
+        """
+        与代理进行对话。
+
+        stream 为 True 时，收到响应头后立即返回 AsyncEventStream，可通过 async for 逐个获取事件，
+        或 await collect() 得到与非流式调用相同结构的完整响应。
+
+        Args:
+            agent_id (str): 代理 ID
+            question (str): 问题
+            stream (bool): 是否流式输出，默认 True
+            session_id (Optional[str]): 会话 ID
+            user_id (Optional[str]): 用户 ID
+            extra_params (Optional[Dict]): 额外的参数
+
+        Returns:
+            Union[Dict, AsyncEventStream]: stream 为 False 时为 API 响应数据，否则为事件流
+
+        Raises:
+            RAGflowAPIError: 如果 API 请求失败
+        """
+        url = self._u["agent_completions"].format(agent_id)
+        data = {"question": question, "stream": stream}
+        if session_id:
+            data["session_id"] = session_id
+        if user_id:
+            data["user_id"] = user_id
+        if extra_params:
+            data.update(extra_params)
+        if stream:
+            return await self._stream(url, "与代理对话", data)
+        return await self._request("POST", url, "与代理对话", json=data)
+
+    async def list_agent_sessions(self, agent_id: str, page: int = 1, page_size: int = 30,
+                           orderby: str = "create_time", desc: bool = True,
+                           id: Optional[str] = None, user_id: Optional[str] = None) -> Dict:
+        """
+        列出代理的会话。
+
+        Args:
+            agent_id (str): 代理 ID
+            page (int): 页码，默认 1
+            page_size (int): 每页数量，默认 30
+            orderby (str): 排序字段，默认 "create_time"
+            desc (bool): 是否降序，默认 True
+            id (Optional[str]): 会话 ID 过滤
+            user_id (Optional[str]): 用户 ID 过滤
+
+        Returns:
+            Dict: API 响应数据
+
+        Raises:
+            RAGflowAPIError: 如果 API 请求失败
+        """
+        url = self._u["agent_sessions"].format(agent_id)
+        params = {"page": page, "page_size": page_size, "orderby": orderby, "desc": str(desc).lower()}
+        if id:
+            params["id"] = id
+        if user_id:
+            params["user_id"] = user_id
+        return await self._request("GET", url, "列出代理会话", params=params)
+
+    async def list_agents(self, page: int = 1, page_size: int = 30, orderby: str = "create_time",
+                   desc: bool = True, name: Optional[str] = None, id: Optional[str] = None) -> Dict:
+        """
+        列出代理。
+
+        Args:
+            page (int): 页码，默认 1
+            page_size (int): 每页数量，默认 30
+            orderby (str): 排序字段，默认 "create_time"
+            desc (bool): 是否降序，默认 True
+            name (Optional[str]): 代理名称过滤
+            id (Optional[str]): 代理 ID 过滤
+
+        Returns:
+            Dict: API 响应数据
+
+        Raises:
+            RAGflowAPIError: 如果 API 请求失败
+        """
+        url = self._u["agents"]
+        params = {"page": page, "page_size": page_size, "orderby": orderby, "desc": str(desc).lower()}
+        if name:
+            params["name"] = name
+        if id:
+            params["id"] = id
+        return await self._request("GET", url, "列出代理", params=params)
\ No newline at end of file
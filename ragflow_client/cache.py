@@ -0,0 +1,119 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class LRUCache:
+    """线程安全的 LRU 缓存，支持可选的过期时间（TTL）。"""
+
+    def __init__(self, maxsize: int = 512, ttl: Optional[float] = None):
+        """
+        初始化缓存。
+
+        Args:
+            maxsize (int): 最多保存的条目数，超出时淘汰最久未使用的条目
+            ttl (Optional[float]): 条目的存活时间（秒），None 表示永不过期
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """返回 key 对应的值；不存在或已过期时返回 default。"""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            expires_at, value = item
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """写入 key 对应的值，必要时淘汰最久未使用的条目。"""
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """删除并返回 key 对应的值。"""
+        with self._lock:
+            item = self._data.pop(key, None)
+        return default if item is None else item[1]
+
+    def evict(self, predicate: Callable[[Hashable], bool]) -> int:
+        """
+        删除所有满足条件的条目。
+
+        Args:
+            predicate (Callable[[Hashable], bool]): 判断 key 是否需要删除的函数
+
+        Returns:
+            int: 删除的条目数
+        """
+        with self._lock:
+            keys = [key for key in self._data if predicate(key)]
+            for key in keys:
+                del self._data[key]
+        return len(keys)
+
+    def clear(self) -> None:
+        """清空缓存。"""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SingleFlight:
+    """
+    合并相同 key 的并发调用：同一时刻只有一个调用真正执行，其余调用方等待并共享其结果。
+
+    等待方得到的是结果的深拷贝，避免调用方之间通过同一个对象相互影响：等待方从另存的一份拷贝中复制，
+    执行方的调用方随即修改返回值也不会影响等待方。执行失败时异常同样传给所有等待方。
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        执行 fn 并返回结果；若相同 key 的调用正在进行，则等待它完成。
+
+        Args:
+            key (Hashable): 调用的标识
+            fn (Callable[[], Any]): 实际执行的函数
+
+        Returns:
+            Any: fn 的返回值
+        """
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+        if not leader:
+            return copy.deepcopy(future.result())
+        try:
+            result = fn()
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(copy.deepcopy(result))
+            return result
+        finally:
+            with self._lock:
+                del self._inflight[key]
@@ -0,0 +1,143 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from array import array
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Union
+
+from .metrics import ClientMetrics
+
+
+class EmbeddingCache:
+    """
+    基于 SQLite 的持久化向量缓存，进程重启后仍可命中。
+
+    键为 SHA-256(model + "\\0" + text)，向量以 float32 字节存储。
+    """
+
+    def __init__(self, path: Union[str, Path] = "~/.cache/ragflow-client/embeddings.sqlite3"):
+        """
+        打开（必要时创建）缓存数据库。
+
+        Args:
+            path (Union[str, Path]): 数据库文件路径，默认 ~/.cache/ragflow-client/embeddings.sqlite3
+        """
+        path = Path(path).expanduser()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "key BLOB PRIMARY KEY, model TEXT, dim INT, vec BLOB, ts INT)"
+            )
+            self._conn.commit()
+
+    @staticmethod
+    def key(model: str, text: str) -> bytes:
+        """计算缓存键。"""
+        return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).digest()
+
+    def get_many(self, model: str, texts: Sequence[str]) -> Dict[str, List[float]]:
+        """
+        批量读取向量。
+
+        Args:
+            model (str): 嵌入模型名称
+            texts (Sequence[str]): 文本列表
+
+        Returns:
+            Dict[str, List[float]]: 命中的文本到向量的映射
+        """
+        keys = {self.key(model, text): text for text in texts}
+        found: Dict[str, List[float]] = {}
+        items = list(keys)
+        with self._lock:
+            # SQLite 默认最多 999 个绑定参数
+            for start in range(0, len(items), 900):
+                batch = items[start:start + 900]
+                rows = self._conn.execute(
+                    f"SELECT key, vec FROM embeddings WHERE key IN ({','.join('?' * len(batch))})", batch
+                ).fetchall()
+                for key, vec in rows:
+                    found[keys[key]] = array("f", vec).tolist()
+        return found
+
+    def put_many(self, model: str, vectors: Dict[str, Sequence[float]]) -> None:
+        """
+        批量写入向量。
+
+        Args:
+            model (str): 嵌入模型名称
+            vectors (Dict[str, Sequence[float]]): 文本到向量的映射
+        """
+        now = int(time.time())
+        rows = [(self.key(model, text), model, len(vec), array("f", vec).tobytes(), now)
+                for text, vec in vectors.items()]
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?, ?, ?)", rows)
+            self._conn.commit()
+
+    def get(self, model: str, text: str) -> Optional[List[float]]:
+        """读取单个向量，未命中返回 None。"""
+        return self.get_many(model, [text]).get(text)
+
+    def put(self, model: str, text: str, vector: Sequence[float]) -> None:
+        """写入单个向量。"""
+        self.put_many(model, {text: vector})
+
+    def close(self) -> None:
+        """关闭数据库连接。"""
+        with self._lock:
+            self._conn.close()
+
+
+class CachedEmbedder:
+    """
+    为嵌入函数加上持久化缓存：只有未命中的文本才会调用底层函数。
+
+    实例可直接作为 SemanticCache 的 embed 参数使用。
+    """
+
+    def __init__(self, embed_batch: Callable[[List[str]], Sequence[Sequence[float]]], model: str,
+                 cache: Optional[EmbeddingCache] = None, metrics: Optional[ClientMetrics] = None):
+        """
+        Args:
+            embed_batch (Callable[[List[str]], Sequence[Sequence[float]]]): 批量嵌入函数，按输入顺序返回向量
+            model (str): 嵌入模型名称，作为缓存键的一部分
+            cache (Optional[EmbeddingCache]): 缓存实例，默认使用默认路径的 EmbeddingCache
+            metrics (Optional[ClientMetrics]): 记录命中率的指标对象，默认新建；
+                可通过 RAGflowClient.track_embedder() 改为记入客户端的指标
+        """
+        self._embed_batch = embed_batch
+        self.model = model
+        self.cache = cache if cache is not None else EmbeddingCache()
+        self.metrics = metrics if metrics is not None else ClientMetrics()
+
+    def embed_batch(self, texts: Sequence[str]) -> List[List[float]]:
+        """
+        批量嵌入文本，命中缓存的直接返回，未命中的合并为一次调用后写回缓存。
+
+        Args:
+            texts (Sequence[str]): 文本列表
+
+        Returns:
+            List[List[float]]: 与输入顺序一致的向量列表
+        """
+        found = self.cache.get_many(self.model, texts)
+        hits = sum(1 for text in texts if text in found)
+        self.metrics.record_cache("embedding", True, hits)
+        self.metrics.record_cache("embedding", False, len(texts) - hits)
+        # 重复的未命中文本只嵌入一次
+        misses = list(dict.fromkeys(text for text in texts if text not in found))
+        if misses:
+            fresh = {text: list(vec) for text, vec in zip(misses, self._embed_batch(misses))}
+            self.cache.put_many(self.model, fresh)
+            found.update(fresh)
+        return [found[text] for text in texts]
+
+    def __call__(self, text: str) -> List[float]:
+        return self.embed_batch([text])[0]
@@ -0,0 +1,93 @@
+import threading
+from collections import defaultdict
+from typing import Any, Dict
+
+try:
+    import prometheus_client
+except ImportError:  # 可选依赖，未安装时只在进程内计数
+    prometheus_client = None
+
+if prometheus_client is not None:
+    _CACHE_HITS = prometheus_client.Counter(
+        "ragflow_cache_hits_total", "RAGflow 客户端缓存命中次数", ["cache"])
+    _CACHE_MISSES = prometheus_client.Counter(
+        "ragflow_cache_misses_total", "RAGflow 客户端缓存未命中次数", ["cache"])
+    _HTTP_REQUESTS = prometheus_client.Counter(
+        "ragflow_http_requests_total", "RAGflow API 请求次数", ["endpoint"])
+    _TTFB = prometheus_client.Histogram(
+        "ragflow_ttfb_seconds", "RAGflow API 请求的首字节时间（秒）", ["endpoint"])
+
+
+class ClientMetrics:
+    """
+    客户端指标：缓存命中/未命中次数、各接口的请求次数和首字节时间（TTFB）。
+
+    安装了 prometheus_client 时，同时写入进程级的 Prometheus 指标
+    ragflow_cache_hits_total、ragflow_cache_misses_total、ragflow_http_requests_total
+    和 ragflow_ttfb_seconds，可由应用自行暴露。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cache_hits: Dict[str, int] = defaultdict(int)
+        self._cache_misses: Dict[str, int] = defaultdict(int)
+        self._requests: Dict[str, int] = defaultdict(int)
+        self._ttfb_total: Dict[str, float] = defaultdict(float)
+
+    def record_cache(self, cache: str, hit: bool, count: int = 1) -> None:
+        """
+        记录缓存查找结果。
+
+        Args:
+            cache (str): 缓存名称，例如 "answer"
+            hit (bool): 是否命中
+            count (int): 次数，默认 1
+        """
+        if count <= 0:
+            return
+        with self._lock:
+            (self._cache_hits if hit else self._cache_misses)[cache] += count
+        if prometheus_client is not None:
+            (_CACHE_HITS if hit else _CACHE_MISSES).labels(cache=cache).inc(count)
+
+    def observe_request(self, endpoint: str, ttfb: float) -> None:
+        """
+        记录一次 API 请求。
+
+        Args:
+            endpoint (str): 接口名称
+            ttfb (float): 首字节时间（秒）
+        """
+        with self._lock:
+            self._requests[endpoint] += 1
+            self._ttfb_total[endpoint] += ttfb
+        if prometheus_client is not None:
+            _HTTP_REQUESTS.labels(endpoint=endpoint).inc()
+            _TTFB.labels(endpoint=endpoint).observe(ttfb)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        返回当前指标的快照。
+
+        Returns:
+            Dict[str, Any]: 包含 cache（各缓存的命中、未命中次数和命中率）与 http（各接口的请求次数和平均 TTFB）
+        """
+        with self._lock:
+            caches = set(self._cache_hits) | set(self._cache_misses)
+            return {
+                "cache": {
+                    name: {
+                        "hits": self._cache_hits[name],
+                        "misses": self._cache_misses[name],
+                        "hit_rate": self._cache_hits[name] / (self._cache_hits[name] + self._cache_misses[name]),
+                    }
+                    for name in caches
+                },
+                "http": {
+                    endpoint: {
+                        "requests": count,
+                        "avg_ttfb_seconds": self._ttfb_total[endpoint] / count,
+                    }
+                    for endpoint, count in self._requests.items()
+                },
+            }
@@ -0,0 +1,127 @@
+"""
+RAGflow API 返回对象的轻量数据类。
+
+客户端方法仍返回原始的 dict 响应；需要更紧凑的内存占用或属性访问时，可用 from_dict 将响应中的
+"data" 部分转换为这些对象，例如 [Chunk.from_dict(c) for c in resp["data"]["chunks"]]。
+Python 3.10+ 上使用 __slots__，单个对象不再携带 __dict__。
+"""
+import sys
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, List, Optional, Type, TypeVar
+
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+T = TypeVar("T", bound="_Model")
+
+
+class _Model:
+    """数据类的公共基类，提供从 API 响应构造对象的方法。"""
+
+    __slots__ = ()
+
+    @classmethod
+    def from_dict(cls: Type[T], data: Dict[str, Any]) -> T:
+        """
+        从 API 响应构造对象，未声明的字段保存在 extra 中。
+
+        Args:
+            data (Dict[str, Any]): API 响应中的对象数据
+
+        Returns:
+            对应的数据类实例
+        """
+        names = {f.name for f in fields(cls)} - {"extra"}
+        known = {k: v for k, v in data.items() if k in names}
+        extra = {k: v for k, v in data.items() if k not in names}
+        return cls(**known, extra=extra)
+
+
+@dataclass(frozen=True, **_SLOTS)
+class Dataset(_Model):
+    """数据集。"""
+    id: str
+    name: Optional[str] = None
+    avatar: Optional[str] = None
+    description: Optional[str] = None
+    language: Optional[str] = None
+    embedding_model: Optional[str] = None
+    permission: Optional[str] = None
+    chunk_method: Optional[str] = None
+    parser_config: Optional[Dict[str, Any]] = None
+    chunk_count: Optional[int] = None
+    document_count: Optional[int] = None
+    create_time: Optional[int] = None
+    update_time: Optional[int] = None
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(frozen=True, **_SLOTS)
+class Document(_Model):
+    """文档。"""
+    id: str
+    name: Optional[str] = None
+    dataset_id: Optional[str] = None
+    location: Optional[str] = None
+    size: Optional[int] = None
+    type: Optional[str] = None
+    chunk_method: Optional[str] = None
+    parser_config: Optional[Dict[str, Any]] = None
+    run: Optional[str] = None
+    progress: Optional[float] = None
+    progress_msg: Optional[str] = None
+    chunk_count: Optional[int] = None
+    token_count: Optional[int] = None
+    create_time: Optional[int] = None
+    update_time: Optional[int] = None
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(frozen=True, **_SLOTS)
+class Chunk(_Model):
+    """分块。"""
+    id: str
+    content: Optional[str] = None
+    document_id: Optional[str] = None
+    dataset_id: Optional[str] = None
+    important_keywords: List[str] = field(default_factory=list)
+    available: Optional[bool] = None
+    positions: Optional[List[Any]] = None
+    docnm_kwd: Optional[str] = None
+    image_id: Optional[str] = None
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(frozen=True, **_SLOTS)
+class Chat(_Model):
+    """聊天助手。"""
+    id: str
+    name: Optional[str] = None
+    avatar: Optional[str] = None
+    dataset_ids: List[str] = field(default_factory=list)
+    llm: Optional[Dict[str, Any]] = None
+    prompt: Optional[Dict[str, Any]] = None
+    create_time: Optional[int] = None
+    update_time: Optional[int] = None
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(frozen=True, **_SLOTS)
+class Session(_Model):
+    """会话。"""
+    id: str
+    name: Optional[str] = None
+    chat_id: Optional[str] = None
+    messages: List[Dict[str, Any]] = field(default_factory=list)
+    create_time: Optional[int] = None
+    update_time: Optional[int] = None
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(frozen=True, **_SLOTS)
+class ConverseResponse(_Model):
+    """对话结果。"""
+    answer: str = ""
+    reference: Optional[Dict[str, Any]] = None
+    id: Optional[str] = None
+    session_id: Optional[str] = None
+    extra: Dict[str, Any] = field(default_factory=dict)
@@ -0,0 +1,111 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional, Sequence, Tuple, Union
+
+from ._json import dumps, loads
+
+
+class ResponseCache:
+    """
+    基于 SQLite 的持久化响应缓存，进程重启后仍可命中，也可由多个进程共享。
+
+    保存的是解析后的 JSON 响应；键为凭据范围、请求方法、URL、查询参数和请求体的 SHA-256，
+    使用不同 API 密钥的客户端共享同一数据库时互不命中。
+    适合评测等反复以相同参数调用 retrieve_chunks 的场景。
+    """
+
+    def __init__(self, path: Union[str, Path] = "~/.cache/ragflow-client/responses.sqlite3",
+                 ttl: Optional[float] = 86400):
+        """
+        打开（必要时创建）缓存数据库。
+
+        Args:
+            path (Union[str, Path]): 数据库文件路径，默认 ~/.cache/ragflow-client/responses.sqlite3
+            ttl (Optional[float]): 条目的默认存活时间（秒），默认 86400；None 表示永不过期
+        """
+        path = Path(path).expanduser()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key BLOB PRIMARY KEY, scope TEXT, url TEXT, value BLOB, expires_at REAL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS responses_scope_url ON responses (scope, url)")
+            self._conn.commit()
+
+    @staticmethod
+    def key(scope: str, method: str, url: str, params: Sequence[Tuple[str, Any]], body: Optional[bytes]) -> bytes:
+        """计算缓存键，scope 为凭据的摘要。"""
+        parts = [scope, method, url, [list(param) for param in params], body.decode("utf-8") if body else None]
+        return hashlib.sha256(dumps(parts)).digest()
+
+    def get(self, key: bytes) -> Optional[Any]:
+        """读取缓存的响应，不存在或已过期时返回 None。"""
+        with self._lock:
+            row = self._conn.execute("SELECT value, expires_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            value, expires_at = row
+            if expires_at is not None and expires_at <= time.time():
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+        return loads(value)
+
+    def set(self, key: bytes, scope: str, url: str, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        写入响应。
+
+        Args:
+            key (bytes): 缓存键
+            scope (str): 凭据的摘要，与计算 key 时相同
+            url (str): 请求 URL，用于按前缀清除
+            value (Any): 解析后的响应
+            ttl (Optional[float]): 存活时间（秒），默认使用实例的 ttl
+        """
+        ttl = ttl if ttl is not None else self.ttl
+        expires_at = time.time() + ttl if ttl is not None else None
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                               (key, scope, url, dumps(value), expires_at))
+            self._conn.commit()
+
+    def evict(self, prefix: str, scope: Optional[str] = None) -> int:
+        """
+        删除 URL 以 prefix 开头的条目。
+
+        Args:
+            prefix (str): URL 前缀
+            scope (Optional[str]): 只删除此凭据范围内的条目，默认不限
+
+        Returns:
+            int: 删除的条目数
+        """
+        sql = "DELETE FROM responses WHERE substr(url, 1, ?) = ?"
+        args: Tuple[Any, ...] = (len(prefix), prefix)
+        if scope is not None:
+            sql += " AND scope = ?"
+            args += (scope,)
+        with self._lock:
+            cursor = self._conn.execute(sql, args)
+            self._conn.commit()
+        return cursor.rowcount
+
+    def clear(self) -> None:
+        """清空缓存。"""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def close(self) -> None:
+        """关闭数据库连接。"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,195 @@
+import functools
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, FrozenSet, Hashable, Iterable, List, NamedTuple, Optional, Sequence, Set
+
+import numpy as np
+
+
+def jaccard(a: Iterable[Hashable], b: Iterable[Hashable]) -> float:
+    """计算两个集合的 Jaccard 相似度；两者均为空时返回 0。"""
+    a, b = set(a), set(b)
+    union = a | b
+    return len(a & b) / len(union) if union else 0.0
+
+
+class LSHIndex:
+    """
+    基于随机超平面投影的局部敏感哈希（LSH）索引，用于快速查找余弦相似的向量。
+
+    每张哈希表使用 n_planes 个随机超平面，将向量落在各超平面哪一侧编码为 bytes 桶键；
+    多张表取并集以提高召回率。返回的只是候选集合，调用方需要再用余弦相似度精确校验。
+    """
+
+    def __init__(self, dim: int, n_planes: int = 16, n_tables: int = 8, seed: int = 0):
+        """
+        初始化索引。
+
+        Args:
+            dim (int): 向量维度
+            n_planes (int): 每张哈希表的超平面数，默认 16
+            n_tables (int): 哈希表数量，默认 8
+            seed (int): 生成随机超平面的种子，默认 0
+        """
+        rng = np.random.default_rng(seed)
+        self.dim = dim
+        self._planes = rng.standard_normal((n_tables, n_planes, dim)).astype(np.float32)
+        self._tables: List[Dict[bytes, Set[Hashable]]] = [{} for _ in range(n_tables)]
+
+    def _keys(self, vec: np.ndarray) -> List[bytes]:
+        bits = (self._planes @ vec) > 0
+        return [np.packbits(row).tobytes() for row in bits]
+
+    def add(self, item_id: Hashable, vec: np.ndarray) -> None:
+        """将向量加入索引。"""
+        for table, key in zip(self._tables, self._keys(vec)):
+            table.setdefault(key, set()).add(item_id)
+
+    def remove(self, item_id: Hashable, vec: np.ndarray) -> None:
+        """从索引中移除向量，vec 须与加入时相同。"""
+        for table, key in zip(self._tables, self._keys(vec)):
+            bucket = table.get(key)
+            if bucket is not None:
+                bucket.discard(item_id)
+                if not bucket:
+                    del table[key]
+
+    def query(self, vec: np.ndarray) -> Set[Hashable]:
+        """返回与 vec 至少在一张表中同桶的候选 ID。"""
+        candidates: Set[Hashable] = set()
+        for table, key in zip(self._tables, self._keys(vec)):
+            candidates |= table.get(key, set())
+        return candidates
+
+    def clear(self) -> None:
+        """清空索引。"""
+        for table in self._tables:
+            table.clear()
+
+
+class SemanticCacheEntry(NamedTuple):
+    """语义缓存中的一条记录。"""
+    value: Any
+    evidence: FrozenSet[str]
+    scopes: FrozenSet[str]
+    similarity: float
+
+
+class SemanticCache:
+    """
+    语义缓存：改写过的近似问题也能命中之前的答案。
+
+    问题向量由调用方提供的 embed 函数计算（客户端本身不依赖任何嵌入模型），先经 LSH 取候选，
+    再要求余弦相似度不低于 similarity_threshold。每条记录同时保存生成答案时引用的证据（分块 ID），
+    调用方应在返回缓存答案前用 jaccard() 校验当前检索到的证据与之足够一致，
+    避免相似但实际不同的问题“劫持”缓存。
+    """
+
+    def __init__(self, embed: Callable[[str], Sequence[float]], dim: int,
+                 similarity_threshold: float = 0.95, evidence_threshold: float = 0.8,
+                 maxsize: int = 1024, ttl: Optional[float] = None,
+                 n_planes: int = 16, n_tables: int = 8, embed_cache_size: int = 1024):
+        """
+        初始化语义缓存。
+
+        Args:
+            embed (Callable[[str], Sequence[float]]): 将文本转换为向量的函数
+            dim (int): 向量维度
+            similarity_threshold (float): 命中所需的最小余弦相似度，默认 0.95
+            evidence_threshold (float): 证据集合的最小 Jaccard 相似度，默认 0.8
+            maxsize (int): 最多保存的条目数，默认 1024
+            ttl (Optional[float]): 条目的存活时间（秒），None 表示永不过期
+            n_planes (int): LSH 每张表的超平面数，默认 16
+            n_tables (int): LSH 哈希表数量，默认 8
+            embed_cache_size (int): 文本向量的内存缓存大小，默认 1024
+        """
+        self.similarity_threshold = similarity_threshold
+        self.evidence_threshold = evidence_threshold
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._embed_cached = functools.lru_cache(maxsize=embed_cache_size)(self._embed_uncached)
+        self._raw_embed = embed
+        self._index = LSHIndex(dim, n_planes=n_planes, n_tables=n_tables)
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def _embed_uncached(self, text: str) -> np.ndarray:
+        vec = np.asarray(self._raw_embed(text), dtype=np.float32)
+        norm = np.linalg.norm(vec)
+        vec = vec / norm if norm else vec
+        vec.setflags(write=False)
+        return vec
+
+    def embed(self, text: str) -> np.ndarray:
+        """返回文本的单位向量，相同文本只计算一次。"""
+        return self._embed_cached(text)
+
+    def lookup(self, scope: Hashable, text: str) -> Optional[SemanticCacheEntry]:
+        """
+        查找与 text 语义相近的缓存记录。
+
+        Args:
+            scope (Hashable): 作用域，例如聊天助手 ID，只在同一作用域内匹配
+            text (str): 查询文本
+
+        Returns:
+            Optional[SemanticCacheEntry]: 相似度最高且达到阈值的记录，没有则返回 None
+        """
+        vec = self.embed(text)
+        now = time.monotonic()
+        best = None
+        with self._lock:
+            for item_id in self._index.query(vec):
+                entry = self._entries.get(item_id)
+                if entry is None:
+                    continue
+                entry_scope, entry_vec, value, evidence, scopes, expires_at = entry
+                if expires_at is not None and expires_at <= now:
+                    self._remove(item_id)
+                    continue
+                if entry_scope != scope:
+                    continue
+                similarity = float(entry_vec @ vec)
+                if similarity >= self.similarity_threshold and (best is None or similarity > best[1].similarity):
+                    best = (item_id, SemanticCacheEntry(value, evidence, scopes, similarity))
+            if best is None:
+                return None
+            self._entries.move_to_end(best[0])
+            return best[1]
+
+    def add(self, scope: Hashable, text: str, value: Any, evidence: Iterable[str],
+            scopes: Iterable[str] = ()) -> None:
+        """
+        写入一条缓存记录。
+
+        Args:
+            scope (Hashable): 作用域，例如聊天助手 ID
+            text (str): 问题文本
+            value (Any): 要缓存的答案
+            evidence (Iterable[str]): 答案引用的证据 ID（例如分块 ID）
+            scopes (Iterable[str]): 重新检索证据时使用的范围（例如数据集 ID）
+        """
+        vec = self.embed(text)
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            item_id = self._next_id
+            self._next_id += 1
+            self._entries[item_id] = (scope, vec, value, frozenset(evidence), frozenset(scopes), expires_at)
+            self._index.add(item_id, vec)
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, item_id: int) -> None:
+        entry = self._entries.pop(item_id)
+        self._index.remove(item_id, entry[1])
+
+    def clear(self) -> None:
+        """清空缓存的答案（文本向量缓存保留，因为它不随数据变化）。"""
+        with self._lock:
+            self._entries.clear()
+            self._index.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,151 @@
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Dict, Iterable, Iterator, Optional, Union
+
+from ._json import loads
+from .exceptions import RAGflowAPIError
+
+# 流结束标记（data 为 true 的事件）
+_END = object()
+
+
+def _parse_sse_line(line: Union[bytes, str]) -> Any:
+    """
+    解析一行 SSE 内容。
+
+    Returns:
+        事件数据（dict）；非 data 行或无需返回的事件为 None；流结束时为 _END
+    """
+    if isinstance(line, bytes):
+        if not line.startswith(b"data:"):
+            return None
+    elif not line.startswith("data:"):
+        return None
+    event = loads(line[5:])
+    if event.get("code", 0) != 0:
+        raise RAGflowAPIError(f"流式响应出错: {event.get('code')} - {event.get('message')}")
+    data = event.get("data")
+    if data is True:
+        return _END
+    return data if isinstance(data, dict) else None
+
+
+def iter_sse_events(lines: Iterable[Union[bytes, str]]) -> Iterator[Dict[str, Any]]:
+    """
+    解析 RAGflow 的 server-sent events 流，逐个返回事件中的 data 字段。
+
+    流以 data 为 true 的事件结束；code 不为 0 的事件会抛出异常。
+
+    Args:
+        lines (Iterable[Union[bytes, str]]): 响应体的逐行内容
+
+    Yields:
+        Dict[str, Any]: 事件数据，例如 {"answer": ..., "reference": ...}
+
+    Raises:
+        RAGflowAPIError: 如果服务端在流中返回错误
+    """
+    for line in lines:
+        data = _parse_sse_line(line)
+        if data is _END:
+            return
+        if data is not None:
+            yield data
+
+
+async def aiter_sse_events(lines: AsyncIterable[Union[bytes, str]]) -> AsyncIterator[Dict[str, Any]]:
+    """iter_sse_events 的异步版本，逐行读取异步迭代器。"""
+    async for line in lines:
+        data = _parse_sse_line(line)
+        if data is _END:
+            return
+        if data is not None:
+            yield data
+
+
+def _collected(last: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    # 事件中的答案是累积的，最后一个事件即为完整结果；包装成与非流式响应相同的结构
+    return {"code": 0, "data": last or {}}
+
+
+class EventStream:
+    """
+    流式对话的事件流：可直接迭代逐个获取事件，也可调用 collect() 等待完整结果。
+
+    事件流持有一条 HTTP 连接，迭代结束、调用 close() 或退出 with 语句时释放；只能迭代一次。
+    """
+
+    def __init__(self, lines: Iterable[Union[bytes, str]], close: Callable[[], None]):
+        """
+        Args:
+            lines (Iterable[Union[bytes, str]]): 响应体的逐行内容
+            close (Callable[[], None]): 关闭底层响应的函数
+        """
+        self._events = iter_sse_events(lines)
+        self._close = close
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        try:
+            yield from self._events
+        finally:
+            self.close()
+
+    def collect(self) -> Dict[str, Any]:
+        """
+        读完整个流，返回与非流式调用相同结构的响应。
+
+        Returns:
+            Dict[str, Any]: {"code": 0, "data": 最后一个事件}，其中包含完整答案及 "reference"
+
+        Raises:
+            RAGflowAPIError: 如果服务端在流中返回错误
+        """
+        last = None
+        for last in self:
+            pass
+        return _collected(last)
+
+    def close(self) -> None:
+        """关闭事件流，释放连接。"""
+        self._close()
+
+    def __enter__(self) -> "EventStream":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+class AsyncEventStream:
+    """EventStream 的异步版本，通过 async for 迭代，collect() 和 aclose() 为协程。"""
+
+    def __init__(self, lines: AsyncIterable[Union[bytes, str]], aclose: Callable[[], Awaitable[None]]):
+        """
+        Args:
+            lines (AsyncIterable[Union[bytes, str]]): 响应体的逐行内容
+            aclose (Callable[[], Awaitable[None]]): 关闭底层响应的协程函数
+        """
+        self._events = aiter_sse_events(lines)
+        self._aclose = aclose
+
+    async def __aiter__(self) -> AsyncIterator[Dict[str, Any]]:
+        try:
+            async for event in self._events:
+                yield event
+        finally:
+            await self.aclose()
+
+    async def collect(self) -> Dict[str, Any]:
+        """读完整个流，返回与非流式调用相同结构的响应。"""
+        last = None
+        async for last in self:
+            pass
+        return _collected(last)
+
+    async def aclose(self) -> None:
+        """关闭事件流，释放连接。"""
+        await self._aclose()
+
+    async def __aenter__(self) -> "AsyncEventStream":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.aclose()
@@ -1,25 +1,4 @@
-from setuptools import setup, find_packages
+# 包的元数据和依赖见 pyproject.toml；保留此文件以兼容旧版 pip 的 `pip install -e .`
+from setuptools import setup
 
-setup(
-    name="ragflow-client",
-    version="0.1.0",
-    description="A Python client for the RAGflow API",
-    long_description=open("README.md", encoding="utf-8").read(),
-    long_description_content_type="text/markdown",
-    author="Your Name",
-    author_email="your.email@example.com",
-    url="https://github.com/yourusername/ragflow-client",  # 可选：替换为实际仓库地址
-    packages=find_packages(),
-    install_requires=[
-        "requests>=2.28.0",
-    ],
-    classifiers=[
-        "Programming Language :: Python :: 3",
-        "Programming Language :: Python :: 3.9",
-        "Programming Language :: Python :: 3.10",
-        "Programming Language :: Python :: 3.11",
-        "License :: OSI Approved :: MIT License",
-        "Operating System :: OS Independent",
-    ],
-    python_requires=">=3.9",
-)
\ No newline at end of file
+setup()
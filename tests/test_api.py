@@ -0,0 +1,905 @@
+import asyncio
+import copy
+import gzip
+import io
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from ragflow_client import RAGflowAPIError, RAGflowClient
+from ragflow_client.cache import LRUCache, SingleFlight
+from ragflow_client.response_cache import ResponseCache
+from ragflow_client.streaming import EventStream, iter_sse_events
+
+
+class FakeRAGflow:
+    """
+    本地 HTTP 服务，记录收到的请求，并按 handler(method, path, query, body) 返回 (状态码, 响应体)
+    或 (状态码, 响应体, 响应头)；响应体为 bytes 时原样发送，否则编码为 JSON。
+    """
+
+    def __init__(self):
+        self.requests = []
+        self.handler = lambda method, path, query, body: (200, {"code": 0, "data": {}})
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def handle_any(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                parts = urlsplit(self.path)
+                fake.requests.append((self.command, parts.path, dict(self.headers), body))
+                status, payload, *extra = fake.handler(self.command, parts.path, parse_qs(parts.query), body)
+                if isinstance(payload, bytes):
+                    content, headers = payload, {"Content-Type": "application/octet-stream"}
+                else:
+                    content, headers = json.dumps(payload).encode("utf-8"), {"Content-Type": "application/json"}
+                headers.update(*extra)
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            do_GET = do_POST = do_PUT = do_DELETE = handle_any
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._server.server_port}"
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def count(self, method: str, path: str) -> int:
+        return sum(1 for request in self.requests if request[0] == method and request[1] == path)
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def server():
+    fake = FakeRAGflow()
+    yield fake
+    fake.close()
+
+
+@pytest.fixture
+def client(server):
+    with RAGflowClient(server.url, "TEST_API_KEY") as client:
+        yield client
+
+
+def run_concurrently(*calls):
+    """同时启动多个调用并等待全部完成，按顺序返回结果。"""
+    results = [None] * len(calls)
+    barrier = threading.Barrier(len(calls))
+
+    def run(index, call):
+        barrier.wait()
+        results[index] = call()
+
+    threads = [threading.Thread(target=run, args=(index, call)) for index, call in enumerate(calls)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def run_async(server, use):
+    """创建连接到 server 的 AsyncRAGflowClient，运行 use(client) 返回的协程并返回其结果。"""
+    pytest.importorskip("httpx")
+    from ragflow_client import AsyncRAGflowClient
+
+    async def main():
+        async with AsyncRAGflowClient(server.url, "TEST_API_KEY") as client:
+            return await use(client)
+
+    return asyncio.run(main())
+
+
+# 只读响应缓存
+def test_read_cache_reuses_response_until_write(server, client):
+    client.list_datasets()
+    client.list_datasets()
+    assert server.count("GET", "/api/v1/datasets") == 1
+
+    client.create_dataset(name="test_dataset")
+    client.list_datasets()
+    assert server.count("GET", "/api/v1/datasets") == 2
+
+    client.list_datasets(use_cache=False)
+    assert server.count("GET", "/api/v1/datasets") == 3
+
+
+def test_read_cache_invalidates_retrieval_on_dataset_write(server, client):
+    client.retrieve_chunks("q", dataset_ids=["ds"])
+    client.delete_documents("ds", ["doc"])
+    client.retrieve_chunks("q", dataset_ids=["ds"])
+    assert server.count("POST", "/api/v1/retrieval") == 2
+
+
+def test_read_cache_key_ignores_gzip_timestamp(server):
+    with RAGflowClient(server.url, "TEST_API_KEY", compress_requests=True, compress_threshold=0) as client:
+        client.retrieve_chunks("q", dataset_ids=["ds"])
+        time.sleep(1.1)
+        client.retrieve_chunks("q", dataset_ids=["ds"])
+    assert server.count("POST", "/api/v1/retrieval") == 1
+
+
+def test_read_started_before_write_is_not_cached(server, client):
+    datasets = [{"id": "ds0"}]
+
+    def handler(method, path, query, body):
+        if method == "POST":
+            datasets.append({"id": f"ds{len(datasets)}"})
+            return 200, {"code": 0, "data": datasets[-1]}
+        snapshot = list(datasets)
+        time.sleep(0.3)
+        return 200, {"code": 0, "data": snapshot}
+
+    server.handler = handler
+    reader = threading.Thread(target=client.list_datasets)
+    reader.start()
+    time.sleep(0.1)
+    client.create_dataset(name="test_dataset")
+    assert len(client.list_datasets()["data"]) == 2
+    reader.join()
+    assert len(client.list_datasets()["data"]) == 2
+
+
+def test_clear_read_cache_by_prefix(server, client):
+    client.list_datasets()
+    client.list_chats()
+    client.clear_read_cache("/api/v1/chats")
+    client.list_datasets()
+    client.list_chats()
+    assert server.count("GET", "/api/v1/datasets") == 1
+    assert server.count("GET", "/api/v1/chats") == 2
+
+
+def test_lru_cache_evict():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("c", 3)
+    assert cache.get("a") is None
+    assert cache.evict(lambda key: key == "b") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+# 并发请求合并
+def test_single_flight_shares_result():
+    flight = SingleFlight()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.2)
+        return {"value": 1}
+
+    results = run_concurrently(*[lambda: flight.do("k", slow)] * 4)
+    assert len(calls) == 1
+    assert results == [{"value": 1}] * 4
+    assert len({id(result) for result in results}) == 4
+
+
+def test_single_flight_waiters_do_not_copy_the_leaders_result():
+    flight = SingleFlight()
+    started = threading.Event()
+
+    class SlowCopy(dict):
+        def __deepcopy__(self, memo):
+            time.sleep(0.1)
+            return SlowCopy(copy.deepcopy(dict(self), memo))
+
+    def slow():
+        started.set()
+        time.sleep(0.2)
+        return SlowCopy(value=1)
+
+    def leader():
+        result = flight.do("k", slow)
+        # 执行方的调用方拿到结果后立即修改
+        result["value"] = 2
+        return result
+
+    def waiter():
+        started.wait()
+        return flight.do("k", slow)
+
+    assert run_concurrently(leader, waiter) == [{"value": 2}, {"value": 1}]
+
+
+def test_single_flight_propagates_exception():
+    flight = SingleFlight()
+
+    def fail():
+        time.sleep(0.1)
+        raise RAGflowAPIError("boom")
+
+    def call():
+        try:
+            flight.do("k", fail)
+        except RAGflowAPIError as exc:
+            return str(exc)
+
+    assert run_concurrently(call, call) == ["boom", "boom"]
+
+
+def test_concurrent_reads_are_coalesced(server, client):
+    def handler(method, path, query, body):
+        time.sleep(0.2)
+        return 200, {"code": 0, "data": []}
+
+    server.handler = handler
+    run_concurrently(client.list_datasets, client.list_datasets, client.list_datasets)
+    assert server.count("GET", "/api/v1/datasets") == 1
+
+
+# 对话答案缓存
+def chat_handler(method, path, query, body):
+    request = json.loads(body or b"{}")
+    time.sleep(0.2)
+    answer = f"ans for {request.get('session_id') or request.get('user_id')}"
+    return 200, {"code": 0, "data": {"answer": answer, "reference": {}}}
+
+
+def test_answer_cache_is_not_shared_across_sessions(server, client):
+    server.handler = chat_handler
+    first = client.converse_with_chat("c1", "Hi", stream=False, session_id="A")
+    second = client.converse_with_chat("c1", "Hi", stream=False, session_id="B")
+    assert first["data"]["answer"] == "ans for A"
+    assert second["data"]["answer"] == "ans for B"
+    assert server.count("POST", "/api/v1/chats/c1/completions") == 2
+
+
+def test_answer_cache_is_per_user(server, client):
+    server.handler = chat_handler
+    client.converse_with_chat("c1", "Hi", stream=False, user_id="u1")
+    client.converse_with_chat("c1", " hi", stream=False, user_id="u1")
+    answer = client.converse_with_chat("c1", "Hi", stream=False, user_id="u2")
+    assert answer["data"]["answer"] == "ans for u2"
+    assert server.count("POST", "/api/v1/chats/c1/completions") == 2
+
+
+def test_concurrent_questions_from_different_sessions_are_not_merged(server, client):
+    server.handler = chat_handler
+    results = run_concurrently(
+        lambda: client.converse_with_chat("c1", "Hi", stream=False, user_id="u1"),
+        lambda: client.converse_with_chat("c1", "Hi", stream=False, user_id="u2"),
+        lambda: client.converse_with_chat("c1", "Hi", stream=False, session_id="A"),
+        lambda: client.converse_with_chat("c1", "Hi", stream=False, session_id="B"),
+    )
+    assert [result["data"]["answer"] for result in results] == ["ans for u1", "ans for u2", "ans for A", "ans for B"]
+    assert server.count("POST", "/api/v1/chats/c1/completions") == 4
+
+
+# Idempotency-Key
+def test_concurrent_identical_creates_get_distinct_idempotency_keys(server, client):
+    client.add_chunks_batch("ds", "doc", ["same", "same"])
+    keys = [request[2]["Idempotency-Key"] for request in server.requests if request[0] == "POST"]
+    assert len(keys) == 2
+    assert len(set(keys)) == 2
+
+
+def test_idempotency_key_is_reused_for_retry_after_failure(server, client):
+    statuses = iter([500, 200, 200])
+    server.handler = lambda method, path, query, body: (next(statuses), {"code": 0, "data": {}})
+    with pytest.raises(RAGflowAPIError):
+        client.create_dataset(name="test_dataset")
+    client.create_dataset(name="test_dataset")
+    client.create_dataset(name="test_dataset")
+    keys = [request[2]["Idempotency-Key"] for request in server.requests]
+    assert keys[0] == keys[1]
+    assert keys[2] != keys[1]
+
+
+# 批量接口
+def test_batched_delete_splits_ids(server, client):
+    result = client.delete_datasets([f"ds{i}" for i in range(250)], batch_size=100)
+    bodies = [json.loads(request[3]) for request in server.requests]
+    assert sorted(len(body["ids"]) for body in bodies) == [50, 100, 100]
+    assert result["code"] == 0
+    assert len(result["batches"]) == 3
+
+
+def test_batched_delete_surfaces_failed_batch(server, client):
+    def handler(method, path, query, body):
+        if "bad" in json.loads(body)["ids"]:
+            return 200, {"code": 102, "message": "not found"}
+        return 200, {"code": 0}
+
+    server.handler = handler
+    result = client.delete_datasets(["a", "b", "bad", "c"], batch_size=2)
+    assert result["code"] == 102
+    assert [batch["code"] for batch in result["batches"]] == [0, 102]
+
+
+def upload_handler(method, path, query, body):
+    if b'filename="bad.txt"' in body:
+        return 200, {"code": 102, "message": "unsupported file"}
+    return 200, {"code": 0, "data": [{"id": f"doc{i}"} for i in range(body.count(b'name="file"'))]}
+
+
+@pytest.fixture
+def upload_files(tmp_path):
+    paths = []
+    for name in ["a.txt", "b.txt", "c.txt", "bad.txt", "e.txt"]:
+        path = tmp_path / name
+        path.write_text(name)
+        paths.append(path)
+    return paths
+
+
+def test_upload_documents_merges_batches(server, client, upload_files):
+    server.handler = upload_handler
+    files = [path for path in upload_files if path.name != "bad.txt"]
+    result = client.upload_documents("ds", files, batch_size=2)
+    assert result["code"] == 0
+    assert len(result["data"]) == 4
+    assert len(result["batches"]) == 2
+
+
+def test_upload_documents_surfaces_failed_batch(server, client, upload_files):
+    server.handler = upload_handler
+    result = client.upload_documents("ds", upload_files, batch_size=2)
+    assert result["code"] == 102
+    assert [batch["code"] for batch in result["batches"]] == [0, 102, 0]
+
+
+def test_buffered_upload_reads_files_concurrently(server, client, upload_files, monkeypatch):
+    from ragflow_client import api
+
+    read_file = api._read_upload_file
+
+    def slow_read(file_path):
+        time.sleep(0.2)
+        return read_file(file_path)
+
+    # 未安装 requests-toolbelt 时的上传方式
+    monkeypatch.setattr(api, "MultipartEncoder", None)
+    monkeypatch.setattr(api, "_read_upload_file", slow_read)
+    server.handler = upload_handler
+    files = [path for path in upload_files if path.name != "bad.txt"]
+    start = time.monotonic()
+    result = client.upload_documents("ds", files)
+    assert time.monotonic() - start < 0.5
+    assert len(result["data"]) == 4
+    body = server.requests[0][3]
+    assert all(f'filename="{path.name}"'.encode() in body and path.read_bytes() in body for path in files)
+
+
+def test_async_upload_documents_surfaces_failed_batch(server, upload_files):
+    server.handler = upload_handler
+    files = [path for path in upload_files if path.name != "bad.txt"]
+    result = run_async(server, lambda client: client.upload_documents("ds", files, batch_size=2))
+    assert result["code"] == 0
+    assert len(result["data"]) == 4
+    result = run_async(server, lambda client: client.upload_documents("ds", upload_files, batch_size=2))
+    assert result["code"] == 102
+    assert [batch["code"] for batch in result["batches"]] == [0, 102, 0]
+
+
+# 分页遍历
+def test_iter_all_documents_with_total(server, client):
+    def handler(method, path, query, body):
+        page, size = int(query["page"][0]), int(query["page_size"][0])
+        docs = [{"id": f"doc{i}"} for i in range((page - 1) * size, min(page * size, 5))]
+        return 200, {"code": 0, "data": {"docs": docs, "total": 5}}
+
+    server.handler = handler
+    docs = list(client.iter_all_documents("ds", page_size=2))
+    assert [doc["id"] for doc in docs] == [f"doc{i}" for i in range(5)]
+    assert server.count("GET", "/api/v1/datasets/ds/documents") == 3
+
+
+def test_iter_all_datasets_stops_at_short_page(server, client):
+    def handler(method, path, query, body):
+        page, size = int(query["page"][0]), int(query["page_size"][0])
+        return 200, {"code": 0, "data": [{"id": f"ds{i}"} for i in range((page - 1) * size, min(page * size, 5))]}
+
+    server.handler = handler
+    datasets = list(client.iter_all_datasets(page_size=2, max_workers=2))
+    assert [dataset["id"] for dataset in datasets] == [f"ds{i}" for i in range(5)]
+
+
+def test_iter_pages_raises_on_error_code(server, client):
+    server.handler = lambda method, path, query, body: (200, {"code": 102, "message": "no access"})
+    with pytest.raises(RAGflowAPIError):
+        list(client.iter_all_documents("ds"))
+
+
+# SSE 流式响应
+SSE_LINES = [
+    b'data:{"code": 0, "data": {"answer": "Hel", "reference": {}}}',
+    b"",
+    b'data:{"code": 0, "data": {"answer": "Hello", "reference": {"chunks": []}}}',
+    b"",
+    b'data:{"code": 0, "data": true}',
+    b'data:{"code": 0, "data": {"answer": "ignored"}}',
+]
+
+
+def test_iter_sse_events_stops_at_end_marker():
+    events = list(iter_sse_events(SSE_LINES))
+    assert [event["answer"] for event in events] == ["Hel", "Hello"]
+    assert [event["answer"] for event in iter_sse_events(line.decode() for line in SSE_LINES)] == ["Hel", "Hello"]
+
+
+def test_iter_sse_events_raises_on_error_event():
+    with pytest.raises(RAGflowAPIError):
+        list(iter_sse_events(['data:{"code": 102, "message": "bad"}']))
+
+
+def test_event_stream_collect_returns_last_event_and_closes():
+    closed = []
+    stream = EventStream(SSE_LINES, lambda: closed.append(True))
+    result = stream.collect()
+    assert result == {"code": 0, "data": {"answer": "Hello", "reference": {"chunks": []}}}
+    assert closed
+
+
+# 持久化响应缓存
+def test_response_cache_get_set_and_expiry(tmp_path):
+    cache = ResponseCache(tmp_path / "responses.sqlite3")
+    key = ResponseCache.key("scope", "POST", "http://x/api/v1/retrieval", (), b'{"question": "q"}')
+    assert cache.get(key) is None
+    cache.set(key, "scope", "http://x/api/v1/retrieval", {"code": 0})
+    assert cache.get(key) == {"code": 0}
+    cache.set(key, "scope", "http://x/api/v1/retrieval", {"code": 0}, ttl=0)
+    assert cache.get(key) is None
+    cache.close()
+
+
+def test_response_cache_evict_by_prefix_and_scope(tmp_path):
+    cache = ResponseCache(tmp_path / "responses.sqlite3")
+    for scope in ["a", "b"]:
+        for url in ["http://x/api/v1/retrieval", "http://x/api/v1/datasets"]:
+            cache.set(ResponseCache.key(scope, "GET", url, (), None), scope, url, {"code": 0})
+    assert cache.evict("http://x/api/v1/retrieval", scope="a") == 1
+    assert cache.evict("http://x/api/v1/retrieval") == 1
+    assert cache.get(ResponseCache.key("b", "GET", "http://x/api/v1/datasets", (), None)) == {"code": 0}
+    cache.close()
+
+
+def test_response_cache_survives_clients_and_is_scoped_by_api_key(server, tmp_path):
+    path = tmp_path / "responses.sqlite3"
+    with RAGflowClient(server.url, "tenantA", response_cache=ResponseCache(path)) as client:
+        client.retrieve_chunks("q", dataset_ids=["ds"])
+        client.list_datasets()
+    with RAGflowClient(server.url, "tenantA", response_cache=ResponseCache(path)) as client:
+        client.retrieve_chunks("q", dataset_ids=["ds"])
+        client.list_datasets()
+    assert server.count("POST", "/api/v1/retrieval") == 1
+    # list_* 只使用内存缓存
+    assert server.count("GET", "/api/v1/datasets") == 2
+
+    with RAGflowClient(server.url, "tenantB", response_cache=ResponseCache(path)) as client:
+        client.retrieve_chunks("q", dataset_ids=["ds"])
+    assert server.count("POST", "/api/v1/retrieval") == 2
+    assert server.requests[-1][2]["Authorization"] == "Bearer tenantB"
+
+
+# 语义缓存
+def test_lsh_index_query_and_remove():
+    np = pytest.importorskip("numpy")
+    from ragflow_client.semantic_cache import LSHIndex
+
+    index = LSHIndex(dim=4)
+    vec = np.array([1.0, 0.0, 0.0, 0.0], dtype=np.float32)
+    index.add("a", vec)
+    assert "a" in index.query(vec)
+    index.remove("a", vec)
+    assert index.query(vec) == set()
+
+
+def test_semantic_cache_matches_similar_question_in_same_scope():
+    pytest.importorskip("numpy")
+    from ragflow_client.semantic_cache import SemanticCache
+
+    vectors = {"how to reset": [1.0, 0.0, 0.0], "how do i reset": [0.99, 0.05, 0.0], "pricing": [0.0, 1.0, 0.0]}
+    cache = SemanticCache(vectors.__getitem__, dim=3, similarity_threshold=0.95)
+    cache.add("chat1", "how to reset", {"answer": "x"}, evidence=["c1"], scopes=["ds"])
+    entry = cache.lookup("chat1", "how do i reset")
+    assert entry is not None and entry.value == {"answer": "x"} and entry.evidence == {"c1"}
+    assert cache.lookup("chat2", "how do i reset") is None
+    assert cache.lookup("chat1", "pricing") is None
+    cache.clear()
+    assert cache.lookup("chat1", "how to reset") is None
+
+
+# 并发解析文档
+def parse_handler(runs):
+    """提交解析时拒绝 ID 以 "bad" 开头的文档；查询文档时按 runs 中的顺序返回解析状态。"""
+    def handler(method, path, query, body):
+        if method == "POST":
+            if any(document_id.startswith("bad") for document_id in json.loads(body)["document_ids"]):
+                return 200, {"code": 102, "message": "You don't own the document"}
+            return 200, {"code": 0}
+        document_id = query["id"][0]
+        return 200, {"code": 0, "data": {"docs": [{"id": document_id, "run": next(runs[document_id])}]}}
+
+    return handler
+
+
+def test_parse_documents_parallel_waits_until_finished(server, client):
+    server.handler = parse_handler({"d1": iter(["RUNNING", "RUNNING", "DONE"]), "d2": iter(["FAIL"])})
+    result = client.parse_documents_parallel("ds", ["d1", "d2"], poll_interval=0.01)
+    assert {document_id: doc["run"] for document_id, doc in result.items()} == {"d1": "DONE", "d2": "FAIL"}
+    assert server.count("GET", "/api/v1/datasets/ds/documents") == 4
+
+
+def test_parse_documents_parallel_does_not_poll_rejected_documents(server, client):
+    server.handler = parse_handler({"d1": iter(["DONE"])})
+    result = client.parse_documents_parallel("ds", ["d1", "bad1"], poll_interval=0.01)
+    assert result["d1"]["run"] == "DONE"
+    assert result["bad1"]["code"] == 102
+    assert server.count("GET", "/api/v1/datasets/ds/documents") == 1
+
+
+def test_parse_documents_parallel_backs_off_until_deadline(server, client):
+    server.handler = parse_handler({"d1": iter(lambda: "RUNNING", None)})
+    start = time.monotonic()
+    with pytest.raises(RAGflowAPIError, match="超时"):
+        client.parse_documents_parallel("ds", ["d1"], poll_interval=0.05, max_poll_interval=0.2, timeout=0.6)
+    # 下一次等待会越过截止时间时提前放弃，而不是睡到超时之后
+    assert time.monotonic() - start < 0.6 + 0.2
+    # 轮询间隔 0.05、0.1、0.2、0.2，第 5 次轮询约在 0.55 秒，之后的等待会越过截止时间
+    assert 3 <= server.count("GET", "/api/v1/datasets/ds/documents") <= 5
+
+
+# 嵌入缓存指标
+def test_cached_embedder_counts_repeated_texts(tmp_path):
+    from ragflow_client.embedding_cache import CachedEmbedder, EmbeddingCache
+
+    calls = []
+
+    def embed_batch(texts):
+        calls.append(list(texts))
+        return [[float(len(text)), 1.0] for text in texts]
+
+    embedder = CachedEmbedder(embed_batch, "m", cache=EmbeddingCache(tmp_path / "embeddings.sqlite3"))
+    assert embedder.embed_batch(["a", "a"]) == [[1.0, 1.0], [1.0, 1.0]]
+    assert calls == [["a"]]
+    assert embedder.metrics.snapshot()["cache"]["embedding"] == {"hits": 0, "misses": 2, "hit_rate": 0.0}
+    embedder.embed_batch(["a", "a", "bb"])
+    assert calls == [["a"], ["bb"]]
+    assert embedder.metrics.snapshot()["cache"]["embedding"]["hits"] == 2
+    assert embedder.metrics.snapshot()["cache"]["embedding"]["misses"] == 3
+
+
+def test_track_embedder_reports_to_client_metrics(client, tmp_path):
+    from ragflow_client.embedding_cache import CachedEmbedder, EmbeddingCache
+
+    embedder = CachedEmbedder(lambda texts: [[1.0] for _ in texts], "m",
+                              cache=EmbeddingCache(tmp_path / "embeddings.sqlite3"))
+    client.track_embedder(embedder)
+    embedder("a")
+    embedder("a")
+    assert client.metrics()["cache"]["embedding"] == {"hits": 1, "misses": 1, "hit_rate": 0.5}
+
+
+# 下载文档
+DOCUMENT_BYTES = bytes(range(256)) * 8192  # 2 MiB，跨越多个拷贝块
+
+
+def download_handler(method, path, query, body):
+    if path.endswith("/missing"):
+        return 404, {"code": 404, "message": "not found"}
+    if path.endswith("/gzipped"):
+        return 200, gzip.compress(DOCUMENT_BYTES), {"Content-Encoding": "gzip"}
+    return 200, DOCUMENT_BYTES
+
+
+def test_download_document_to_path(server, client, tmp_path):
+    server.handler = download_handler
+    target = tmp_path / "out.bin"
+    client.download_document("ds", "doc", target)
+    assert target.read_bytes() == DOCUMENT_BYTES
+
+
+def test_download_document_to_file_object_decodes_gzip(server, client):
+    server.handler = download_handler
+    buffer = io.BytesIO()
+    client.download_document("ds", "gzipped", buffer)
+    assert buffer.getvalue() == DOCUMENT_BYTES
+
+
+def test_download_document_raises_on_http_error(server, client, tmp_path):
+    server.handler = download_handler
+    with pytest.raises(RAGflowAPIError, match="404"):
+        client.download_document("ds", "missing", tmp_path / "out.bin")
+
+
+# 延迟打开的上传文件
+def test_lazy_file_opens_on_first_read_and_closes_at_eof(tmp_path):
+    from ragflow_client.api import _LazyFile
+
+    path = tmp_path / "a.bin"
+    path.write_bytes(b"x" * 10)
+    lazy = _LazyFile(path)
+    assert lazy.len == 10 and lazy._fp is None
+    assert lazy.read(4) == b"xxxx"
+    assert lazy.len == 6 and lazy._fp is not None
+    assert lazy.read() == b"x" * 6
+    assert lazy.len == 0 and lazy._fp is None
+
+    empty = tmp_path / "empty.bin"
+    empty.write_bytes(b"")
+    lazy = _LazyFile(empty)
+    assert lazy.read() == b"" and lazy._fp is None
+
+
+def test_streaming_upload_holds_at_most_one_open_file(server, client, tmp_path, monkeypatch):
+    pytest.importorskip("requests_toolbelt")
+    from ragflow_client import api
+
+    paths = []
+    for index in range(20):
+        path = tmp_path / f"f{index}.txt"
+        path.write_bytes(f"content {index}".encode() * 100)
+        paths.append(path)
+    opened, peak = set(), []
+
+    class TrackedFile(io.FileIO):
+        def __init__(self, file, mode="r"):
+            super().__init__(file, mode)
+            opened.add(self)
+            peak.append(len(opened))
+
+        def close(self):
+            opened.discard(self)
+            super().close()
+
+    monkeypatch.setattr(api, "open", TrackedFile, raising=False)
+    server.handler = upload_handler
+    result = client.upload_documents("ds", paths)
+    assert len(result["data"]) == 20
+    assert max(peak) == 1 and not opened
+    body = server.requests[0][3]
+    assert all(path.read_bytes() in body for path in paths)
+
+
+# 异步客户端
+def test_async_client_sends_json_and_query_params(server):
+    server.handler = lambda method, path, query, body: (200, {"code": 0, "data": {"id": "ds1"}})
+
+    async def use(client):
+        created = await client.create_dataset(name="test_dataset", description=None)
+        await client.list_datasets(page=2, page_size=10, name="test")
+        return created
+
+    assert run_async(server, use) == {"code": 0, "data": {"id": "ds1"}}
+    (_, path, headers, body), (_, list_path, _, _) = server.requests
+    assert path == "/api/v1/datasets" and list_path == "/api/v1/datasets"
+    assert headers["Authorization"] == "Bearer TEST_API_KEY"
+    assert headers["Content-Type"] == "application/json"
+    assert json.loads(body)["name"] == "test_dataset"
+
+
+def test_async_client_raises_on_http_error(server):
+    server.handler = lambda method, path, query, body: (500, {"code": 500, "message": "boom"})
+    with pytest.raises(RAGflowAPIError, match="500"):
+        run_async(server, lambda client: client.list_datasets())
+
+
+def test_async_gather_upload_uploads_each_file_and_raises_on_failure(server, upload_files):
+    def handler(method, path, query, body):
+        if b'filename="bad.txt"' in body:
+            return 500, {"code": 500, "message": "unsupported file"}
+        return upload_handler(method, path, query, body)
+
+    server.handler = handler
+    files = [path for path in upload_files if path.name != "bad.txt"]
+    results = run_async(server, lambda client: client.gather_upload("ds", files, max_concurrency=2))
+    assert [result["data"] for result in results] == [[{"id": "doc0"}]] * 4
+    assert server.count("POST", "/api/v1/datasets/ds/documents") == 4
+
+    server.requests.clear()
+    with pytest.raises(RAGflowAPIError, match="500"):
+        run_async(server, lambda client: client.gather_upload("ds", upload_files))
+    # 单个文件失败不影响其余文件
+    assert server.count("POST", "/api/v1/datasets/ds/documents") == 5
+
+
+def test_async_download_document(server, tmp_path):
+    server.handler = download_handler
+    target = tmp_path / "out.bin"
+    run_async(server, lambda client: client.download_document("ds", "doc", target))
+    assert target.read_bytes() == DOCUMENT_BYTES
+
+
+# 流式对话
+SSE_BODY = b"".join(line + b"\n" for line in SSE_LINES)
+
+
+def stream_handler(method, path, query, body):
+    if path.startswith("/api/v1/chats/bad"):
+        return 404, {"code": 404, "message": "chat not found"}
+    return 200, SSE_BODY, {"Content-Type": "text/event-stream"}
+
+
+def test_converse_with_chat_streams_events(server, client):
+    server.handler = stream_handler
+    with client.converse_with_chat("c1", "Hi") as stream:
+        assert [event["answer"] for event in stream] == ["Hel", "Hello"]
+    assert json.loads(server.requests[0][3]) == {"question": "Hi", "stream": True}
+    assert client.converse_with_chat_stream("c1", "Hi").collect()["data"]["answer"] == "Hello"
+    assert client.converse_with_agent("a1", "Hi").collect()["data"]["answer"] == "Hello"
+
+
+def test_converse_with_chat_stream_raises_on_http_error(server, client):
+    server.handler = stream_handler
+    with pytest.raises(RAGflowAPIError, match="404"):
+        client.converse_with_chat("bad", "Hi")
+
+
+def test_async_converse_with_chat_streams_events(server):
+    server.handler = stream_handler
+
+    async def use(client):
+        stream = await client.converse_with_chat("c1", "Hi")
+        events = [event["answer"] async for event in stream]
+        collected = await (await client.converse_with_chat("c1", "Hi")).collect()
+        return events, collected
+
+    events, collected = run_async(server, use)
+    assert events == ["Hel", "Hello"]
+    assert collected == {"code": 0, "data": {"answer": "Hello", "reference": {"chunks": []}}}
+
+
+# httpx 传输
+@pytest.fixture
+def httpx_client(server):
+    pytest.importorskip("httpx")
+    with RAGflowClient(server.url, "TEST_API_KEY", transport="httpx", timeout=(2, 5)) as client:
+        yield client
+
+
+def test_httpx_transport_sends_json_with_session_headers(server, httpx_client):
+    server.handler = lambda method, path, query, body: (200, {"code": 0, "data": [{"id": "ds1"}]})
+    assert httpx_client.list_datasets(page=2)["data"] == [{"id": "ds1"}]
+    httpx_client.create_dataset(name="test_dataset")
+    (_, _, get_headers, _), (_, _, post_headers, body) = server.requests
+    assert get_headers["Authorization"] == "Bearer TEST_API_KEY"
+    assert get_headers["User-Agent"].startswith("ragflow-client/")
+    assert post_headers["Content-Type"] == "application/json"
+    assert "Idempotency-Key" in post_headers
+    assert json.loads(body)["name"] == "test_dataset"
+
+
+def test_httpx_transport_raises_on_http_error(server, httpx_client):
+    server.handler = lambda method, path, query, body: (400, {"code": 400, "message": "bad request"})
+    with pytest.raises(RAGflowAPIError, match="400"):
+        httpx_client.list_datasets()
+
+
+@pytest.mark.parametrize("streaming", [True, False])
+def test_httpx_transport_uploads_with_content_length(server, httpx_client, upload_files, monkeypatch, streaming):
+    from ragflow_client import api
+
+    if streaming:
+        pytest.importorskip("requests_toolbelt")
+    else:
+        monkeypatch.setattr(api, "MultipartEncoder", None)
+    server.handler = upload_handler
+    files = [path for path in upload_files if path.name != "bad.txt"]
+    result = httpx_client.upload_documents("ds", files)
+    assert len(result["data"]) == 4
+    _, _, headers, body = server.requests[0]
+    # 请求头中 None 表示不发送会话默认的 application/json
+    assert headers["Content-Type"].startswith("multipart/form-data; boundary=")
+    assert int(headers["Content-Length"]) == len(body)
+    assert all(path.read_bytes() in body for path in files)
+
+
+def test_httpx_transport_downloads_and_decodes_gzip(server, httpx_client):
+    server.handler = download_handler
+    buffer = io.BytesIO()
+    httpx_client.download_document("ds", "gzipped", buffer)
+    assert buffer.getvalue() == DOCUMENT_BYTES
+
+
+def test_httpx_transport_streams_events(server, httpx_client):
+    server.handler = stream_handler
+    assert [event["answer"] for event in httpx_client.converse_with_chat("c1", "Hi")] == ["Hel", "Hello"]
+    with pytest.raises(RAGflowAPIError, match="404"):
+        httpx_client.converse_with_chat("bad", "Hi")
+
+
+def test_unknown_transport_is_rejected():
+    with pytest.raises(ValueError):
+        RAGflowClient("http://localhost:5000", "TEST_API_KEY", transport="urllib")
+
+
+# 指标
+def test_client_metrics_snapshot():
+    from ragflow_client.metrics import ClientMetrics
+
+    metrics = ClientMetrics()
+    metrics.record_cache("answer", True)
+    metrics.record_cache("answer", False, 3)
+    metrics.record_cache("answer", True, 0)
+    metrics.observe_request("列出数据集", 0.1)
+    metrics.observe_request("列出数据集", 0.3)
+    snapshot = metrics.snapshot()
+    assert snapshot["cache"] == {"answer": {"hits": 1, "misses": 3, "hit_rate": 0.25}}
+    assert snapshot["http"]["列出数据集"]["requests"] == 2
+    assert snapshot["http"]["列出数据集"]["avg_ttfb_seconds"] == pytest.approx(0.2)
+
+
+def test_client_records_read_cache_and_request_metrics(client):
+    client.list_datasets()
+    client.list_datasets()
+    metrics = client.metrics()
+    assert metrics["cache"]["read"] == {"hits": 1, "misses": 1, "hit_rate": 0.5}
+    assert metrics["http"]["列出数据集"]["requests"] == 1
+
+
+# 持久化向量缓存
+def test_embedding_cache_persists_vectors_per_model(tmp_path):
+    from ragflow_client.embedding_cache import EmbeddingCache
+
+    path = tmp_path / "embeddings.sqlite3"
+    cache = EmbeddingCache(path)
+    cache.put_many("m1", {f"text {i}": [float(i), 0.5] for i in range(1000)})
+    cache.put("m2", "text 1", [9.0, 9.0])
+    cache.close()
+
+    cache = EmbeddingCache(path)
+    # 超过 SQLite 单条语句的绑定参数上限时分批查询
+    found = cache.get_many("m1", [f"text {i}" for i in range(1000)] + ["missing"])
+    assert len(found) == 1000
+    assert found["text 7"] == [7.0, 0.5]
+    assert cache.get("m2", "text 1") == [9.0, 9.0]
+    assert cache.get("m2", "text 2") is None
+    cache.close()
+
+
+# 数据类
+def test_models_from_dict_keeps_unknown_fields_in_extra():
+    import dataclasses
+    import sys
+
+    from ragflow_client.models import Chunk, Dataset
+
+    chunk = Chunk.from_dict({"id": "c1", "content": "text", "new_field": 1})
+    assert chunk.id == "c1" and chunk.content == "text"
+    assert chunk.extra == {"new_field": 1}
+    assert Dataset.from_dict({"id": "ds1"}).extra == {}
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        chunk.id = "c2"
+    if sys.version_info >= (3, 10):
+        assert not hasattr(chunk, "__dict__")
+
+# 按需导入
+def test_package_imports_lazily():
+    import subprocess
+    import sys
+
+    code = (
+        "import sys, ragflow_client\n"
+        "assert 'requests' not in sys.modules and 'ragflow_client.api' not in sys.modules\n"
+        "assert 'RAGflowClient' in dir(ragflow_client)\n"
+        "from ragflow_client import RAGflowClient\n"
+        "assert RAGflowClient.__module__ == 'ragflow_client.api'\n"
+        "try:\n"
+        "    ragflow_client.Missing\n"
+        "except AttributeError:\n"
+        "    pass\n"
+        "else:\n"
+        "    raise SystemExit('expected AttributeError')\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=Path(__file__).resolve().parents[1])